@@ -6,12 +6,15 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from kriscv import jobs
 from kriscv.build import semantics
 from kriscv.elf_parser import ELF
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from kriscv.tools import Tools
+
 
 @dataclass
 class KRISCVOpts:
@@ -19,19 +22,59 @@ class KRISCVOpts:
 
 
 @dataclass
-class RunOpts(KRISCVOpts):
-    input_file: Path
+class ExecOpts(KRISCVOpts):
+    in_process: bool
+    binary_kore: bool
+    fused: bool
+    blocks: bool
+
+
+@dataclass
+class RunOpts(ExecOpts):
+    input_file: Path | None
     depth: int | None
     end_symbol: str | None
+    halt_symbols: list[str]
+    max_instrs: int | None
+    halt_on_env_call: bool
     zero_init: bool | None
+    checkpoint_dir: Path | None
+    checkpoint_depth: int
+    resume: Path | None
+    profile: str | None
+    specialize: bool
 
 
 @dataclass
-class RunArchTestOpts(KRISCVOpts):
+class RunArchTestOpts(ExecOpts):
     input_file: Path
     output_file: Path | None
 
 
+@dataclass
+class RunBatchOpts(ExecOpts):
+    input_path: Path
+    output_file: Path | None
+    output_format: str
+    jobs: int | None
+    end_symbol: str | None
+    max_instrs: int | None
+    signature: bool
+
+
+@dataclass
+class ServeOpts(ExecOpts):
+    socket: Path | None
+
+
+@dataclass
+class SpecializeOpts(KRISCVOpts):
+    input_file: Path
+    cache_dir: Path | None
+    force: bool
+    verbose: bool
+
+
 def kriscv(args: Sequence[str]) -> None:
     opts = _parse_args(args)
     match opts:
@@ -39,6 +82,12 @@ def kriscv(args: Sequence[str]) -> None:
             _kriscv_run(opts)
         case RunArchTestOpts():
             _kriscv_run_arch_test(opts)
+        case RunBatchOpts():
+            _kriscv_run_batch(opts)
+        case ServeOpts():
+            _kriscv_serve(opts)
+        case SpecializeOpts():
+            _kriscv_specialize(opts)
         case _:
             raise AssertionError()
 
@@ -51,64 +100,162 @@ def _parse_args(args: Sequence[str]) -> KRISCVOpts:
 
     match ns.command:
         case 'run':
+            if (ns.input_file is None) == (ns.resume is None):
+                raise ValueError('Expected exactly one of FILE or --resume')
+            if ns.specialize and (ns.input_file is None or ns.in_process or ns.fused or ns.blocks):
+                raise ValueError(
+                    '--specialize requires FILE, and is incompatible with --in-process, --fused and --blocks'
+                )
             return RunOpts(
                 temp_dir=ns.temp_dir,
-                input_file=ns.input_file.resolve(strict=True),
+                in_process=ns.in_process,
+                binary_kore=ns.binary_kore,
+                fused=ns.fused,
+                blocks=ns.blocks,
+                input_file=ns.input_file.resolve(strict=True) if ns.input_file is not None else None,
                 depth=ns.depth if ns.depth is not None and ns.depth >= 0 else None,
                 end_symbol=ns.end_symbol,
+                halt_symbols=ns.halt_symbols,
+                max_instrs=ns.max_instrs,
+                halt_on_env_call=ns.halt_on_env_call,
                 zero_init=ns.zero_init,
+                checkpoint_dir=ns.checkpoint_dir,
+                checkpoint_depth=ns.checkpoint_depth,
+                resume=ns.resume.resolve(strict=True) if ns.resume is not None else None,
+                profile=ns.profile,
+                specialize=ns.specialize,
             )
         case 'run-arch-test':
             return RunArchTestOpts(
                 temp_dir=ns.temp_dir,
+                in_process=ns.in_process,
+                binary_kore=ns.binary_kore,
+                fused=ns.fused,
+                blocks=ns.blocks,
                 input_file=ns.input_file.resolve(strict=True),
                 output_file=ns.output_file,
             )
+        case 'run-batch':
+            return RunBatchOpts(
+                temp_dir=ns.temp_dir,
+                in_process=ns.in_process,
+                binary_kore=ns.binary_kore,
+                fused=ns.fused,
+                blocks=ns.blocks,
+                input_path=ns.input_path.resolve(strict=True),
+                output_file=ns.output_file,
+                output_format=ns.output_format,
+                jobs=ns.jobs,
+                end_symbol=ns.end_symbol,
+                max_instrs=ns.max_instrs,
+                signature=ns.signature,
+            )
+        case 'serve':
+            return ServeOpts(
+                temp_dir=ns.temp_dir,
+                in_process=ns.in_process,
+                binary_kore=ns.binary_kore,
+                fused=ns.fused,
+                blocks=ns.blocks,
+                socket=ns.socket,
+            )
+        case 'specialize':
+            return SpecializeOpts(
+                temp_dir=ns.temp_dir,
+                input_file=ns.input_file.resolve(strict=True),
+                cache_dir=ns.cache_dir,
+                force=ns.force,
+                verbose=ns.verbose,
+            )
         case _:
             raise AssertionError()
 
 
-def _kriscv_run(opts: RunOpts) -> None:
-    tools = semantics(temp_dir=opts.temp_dir)
-    regs = dict.fromkeys(range(32), 0) if opts.zero_init else {}
-    init_conf = tools.config_from_elf(
-        opts.input_file,
-        regs=regs,
-        end_symbol=opts.end_symbol,
+def _semantics(opts: ExecOpts) -> Tools:
+    return semantics(
+        temp_dir=opts.temp_dir,
+        in_process=opts.in_process,
+        binary_kore=opts.binary_kore,
+        fused=opts.fused,
+        blocks=opts.blocks,
     )
-    final_conf = tools.run_config(init_conf, depth=opts.depth)
-    print(tools.kprint.pretty_print(final_conf, sort_collections=True))
 
 
-def _kriscv_run_arch_test(opts: RunArchTestOpts) -> None:
-    input = opts.input_file
-    tools = semantics(temp_dir=opts.temp_dir)
-    init_conf = tools.config_from_elf(input, end_symbol='_halt')
-    final_conf = tools.run_config(init_conf)
-    memory = tools.get_memory(final_conf)
-
-    elf = ELF.load(input)
-    begin_sig_addr = elf.unique_symbol('begin_signature', error_loc=str(input)).addr
-    end_sig_addr = elf.unique_symbol('end_signature', error_loc=str(input)).addr
+def _kriscv_run(opts: RunOpts) -> None:
+    from kriscv.profile import Profile, phase
+
+    if opts.specialize:
+        from kriscv.build import specialized_semantics
+
+        assert opts.input_file is not None
+        tools = specialized_semantics(opts.input_file, temp_dir=opts.temp_dir, binary_kore=opts.binary_kore)
+    else:
+        tools = _semantics(opts)
+    profile = Profile() if opts.profile is not None else None
+
+    start_depth = 0
+    start_instret = 0
+    if opts.resume is not None:
+        from kriscv.snapshot import Snapshot
+
+        with phase(profile, 'load_snapshot'):
+            snapshot = Snapshot.read(opts.resume)
+        with phase(profile, 'build_config'):
+            init_conf = tools.kore_config_from_snapshot(snapshot)
+        start_depth = snapshot.depth
+        start_instret = snapshot.instret
+    else:
+        assert opts.input_file is not None
+        with phase(profile, 'load_elf'):
+            elf = ELF.load(opts.input_file)
+        regs = dict.fromkeys(range(32), 0) if opts.zero_init else {}
+        with phase(profile, 'build_config'):
+            init_conf = tools.kore_config_from_elf(
+                elf,
+                regs=regs,
+                end_symbol=opts.end_symbol,
+                halt_symbols=opts.halt_symbols,
+                max_instrs=opts.max_instrs,
+                halt_on_env_call=opts.halt_on_env_call,
+            )
 
-    if begin_sig_addr % 4 != 0:
-        raise AssertionError(
-            'Signature region must begin at an XLEN-bit boundary, but begins at address 0x{begin_sig_addr:08X}.'
-        )
-    if (end_sig_addr - begin_sig_addr) % 4 != 0:
-        raise AssertionError(
-            'Signature region must contain a series 32-bit words, but spans addresses 0x{begin_sig_addr:08X}-0x{end_sig_addr:08X}.'
+    if opts.checkpoint_dir is not None:
+        final_state = tools.run_checkpointed(
+            init_conf,
+            checkpoint_dir=opts.checkpoint_dir,
+            checkpoint_depth=opts.checkpoint_depth,
+            depth=opts.depth,
+            start_depth=start_depth,
+            profile=profile,
         )
+    else:
+        final_state = tools.run(init_conf, depth=opts.depth, profile=profile)
 
-    def _addr_to_hex(addr: int) -> str:
-        if addr not in memory:
-            return '--'
-        byte = memory[addr]
-        assert 0 <= byte <= 0xFF
-        return f'{byte:02x}'
+    with phase(profile, 'kore_to_kast'):
+        final_config = final_state.kast
+    with phase(profile, 'pretty_print'):
+        output = tools.kprint.pretty_print(final_config, sort_collections=True)
+    print(output)
+
+    if profile is not None:
+        profile.count('instret', final_state.instret - start_instret)
+        profile.count('segments', len(final_state.segments()))
+        if opts.profile == 'json':
+            import json
+
+            print(json.dumps(profile.to_dict()), file=sys.stderr)
+        else:
+            print(profile.pretty(), file=sys.stderr)
+
+
+def _kriscv_run_arch_test(opts: RunArchTestOpts) -> None:
+    input = opts.input_file
+    tools = _semantics(opts)
+    init_conf = tools.kore_config_from_elf(input, end_symbol='_halt')
+    segments = tools.run(init_conf).segments()
 
-    merged_sig = [_addr_to_hex(addr) for addr in range(begin_sig_addr, end_sig_addr)]
-    signature = [''.join(reversed(merged_sig[i : i + 4])) for i in range(0, len(merged_sig), 4)]
+    elf = ELF.load(input)
+    signature = jobs.signature(elf, segments, error_loc=str(input))
 
     if opts.output_file is None:
         for word in signature:
@@ -120,6 +267,55 @@ def _kriscv_run_arch_test(opts: RunArchTestOpts) -> None:
             out.write(word + '\n')
 
 
+def _kriscv_run_batch(opts: RunBatchOpts) -> None:
+    import json
+
+    from kriscv.batch import load_jobs, run_batch
+
+    defaults = {'end_symbol': opts.end_symbol, 'max_instrs': opts.max_instrs, 'signature': opts.signature}
+    batch_jobs = load_jobs(opts.input_path, defaults=defaults)
+    tools = _semantics(opts)
+    results = run_batch(tools, batch_jobs, processes=opts.jobs)
+
+    failed = 0
+    out = sys.stdout if opts.output_file is None else open(opts.output_file, 'w')
+    try:
+        if opts.output_format == 'jsonl':
+            for result in results:
+                failed += 'error' in result
+                out.write(json.dumps(result) + '\n')
+                out.flush()
+        else:
+            result_list = list(results)
+            failed = sum('error' in result for result in result_list)
+            json.dump(result_list, out, indent=2)
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if failed:
+        sys.exit(f'{failed} of {len(batch_jobs)} jobs failed')
+
+
+def _kriscv_serve(opts: ServeOpts) -> None:
+    from kriscv.server import JobServer
+
+    server = JobServer(_semantics(opts))
+    server.warm_up()
+    if opts.socket is None:
+        server.serve_stdio()
+    else:
+        server.serve_socket(opts.socket)
+
+
+def _kriscv_specialize(opts: SpecializeOpts) -> None:
+    from kriscv.specialize import specialize
+
+    definition_dir = specialize(opts.input_file, cache_dir=opts.cache_dir, force=opts.force, verbose=opts.verbose)
+    print(definition_dir)
+
+
 def _arg_parser() -> ArgumentParser:
     parser = ArgumentParser(prog='kriscv')
 
@@ -128,16 +324,62 @@ def _arg_parser() -> ArgumentParser:
     common_parser = ArgumentParser(add_help=False)
     common_parser.add_argument('--temp-dir', type=Path, help='directory where temporary files should be saved')
 
-    run_parser = command_parser.add_parser('run', help='execute a RISC-V ELF file', parents=[common_parser])
-    run_parser.add_argument('input_file', type=Path, metavar='FILE', help='RISC-V ELF file to run')
+    exec_parser = ArgumentParser(add_help=False)
+    exec_parser.add_argument(
+        '--in-process', action='store_true', help='execute through the LLVM runtime bindings instead of krun'
+    )
+    exec_parser.add_argument(
+        '--binary-kore', action='store_true', help='exchange configurations with the interpreter in binary Kore'
+    )
+    exec_parser.add_argument(
+        '--fused', action='store_true', help='execute common instructions in a single rewrite step each'
+    )
+    exec_parser.add_argument(
+        '--blocks', action='store_true', help='execute straight-line basic blocks of instructions as one unit'
+    )
+
+    run_parser = command_parser.add_parser(
+        'run', help='execute a RISC-V ELF file', parents=[common_parser, exec_parser]
+    )
+    run_parser.add_argument('input_file', type=Path, nargs='?', metavar='FILE', help='RISC-V ELF file to run')
     run_parser.add_argument('-d', '--depth', type=int, help='execution depth (set negative for unbounded execution)')
     run_parser.add_argument('--end-symbol', type=str, help='symbol marking the address which terminates execution')
+    run_parser.add_argument(
+        '--halt-symbol',
+        dest='halt_symbols',
+        action='append',
+        default=[],
+        help='additional symbol marking an address which terminates execution (can be repeated)',
+    )
+    run_parser.add_argument('--max-instrs', type=int, help='terminate execution after this many retired instructions')
+    run_parser.add_argument(
+        '--halt-on-env-call', action='store_true', help='terminate execution on ECALL and EBREAK instructions'
+    )
     run_parser.add_argument('-z', '--zero-init', action='store_true', help='initialize registers to zero')
+    run_parser.add_argument(
+        '--checkpoint-dir', type=Path, help='run in slices, saving a snapshot of the state after each to this directory'
+    )
+    run_parser.add_argument(
+        '--checkpoint-depth', type=int, default=100000, help='number of steps between snapshots (default: 100000)'
+    )
+    run_parser.add_argument('--resume', type=Path, metavar='SNAPSHOT', help='resume execution from a snapshot')
+    run_parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='text',
+        choices=['text', 'json'],
+        help='report time per phase and execution counters on stderr, as text (default) or JSON',
+    )
+    run_parser.add_argument(
+        '--specialize',
+        action='store_true',
+        help='execute on the semantics specialized to FILE, see `kriscv specialize`',
+    )
 
     run_arch_test_parser = command_parser.add_parser(
         'run-arch-test',
         help='execute a RISC-V Architectural Test ELF file and dump the test signature',
-        parents=[common_parser],
+        parents=[common_parser, exec_parser],
     )
     run_arch_test_parser.add_argument(
         'input_file', type=Path, metavar='FILE', help='RISC-V Architectural Test ELF file to run'
@@ -146,6 +388,48 @@ def _arg_parser() -> ArgumentParser:
         '-o', '--output', dest='output_file', type=Path, help='output file for the test signature'
     )
 
+    run_batch_parser = command_parser.add_parser(
+        'run-batch',
+        help='execute many RISC-V ELF files on a pool of worker processes',
+        parents=[common_parser, exec_parser],
+    )
+    run_batch_parser.add_argument(
+        'input_path', type=Path, metavar='PATH', help='directory of ELF files, or JSON-lines manifest of jobs'
+    )
+    run_batch_parser.add_argument('-o', '--output', dest='output_file', type=Path, help='output file for the results')
+    run_batch_parser.add_argument(
+        '--format', dest='output_format', choices=['json', 'jsonl'], default='jsonl', help='format of the results'
+    )
+    run_batch_parser.add_argument('-j', '--jobs', type=int, help='number of worker processes (default: CPU count)')
+    run_batch_parser.add_argument(
+        '--end-symbol', type=str, help='symbol marking the address which terminates execution, unless set by the job'
+    )
+    run_batch_parser.add_argument(
+        '--max-instrs', type=int, help='terminate execution after this many retired instructions, unless set by the job'
+    )
+    run_batch_parser.add_argument(
+        '--signature', action='store_true', help='extract the architectural test signature, unless set by the job'
+    )
+
+    serve_parser = command_parser.add_parser(
+        'serve',
+        help='load the semantics once and execute JSON-lines jobs read from stdin or a Unix socket',
+        parents=[common_parser, exec_parser],
+    )
+    serve_parser.add_argument('--socket', type=Path, help='listen on a Unix socket instead of stdin/stdout')
+
+    specialize_parser = command_parser.add_parser(
+        'specialize',
+        help='kompile the semantics specialized to a RISC-V ELF file, and print the definition directory',
+        parents=[common_parser],
+    )
+    specialize_parser.add_argument('input_file', type=Path, metavar='FILE', help='RISC-V ELF file to specialize to')
+    specialize_parser.add_argument(
+        '--cache-dir', type=Path, help='directory of specialized definitions (default: next to the kdist targets)'
+    )
+    specialize_parser.add_argument('--force', action='store_true', help='rebuild the definition even if cached')
+    specialize_parser.add_argument('-v', '--verbose', action='store_true', help='print the kompile commands')
+
     return parser
 
 
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from pyk.kast.prelude.k import GENERATED_TOP_CELL
+
+from .jobs import Job, run_job
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from pathlib import Path
+    from typing import Any, Final
+
+    from .tools import Tools
+
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+# Set in the parent before the pool forks, so that workers inherit the loaded definition
+_TOOLS: Tools | None = None
+
+
+def load_jobs(path: Path, *, defaults: Mapping[str, Any] | None = None) -> list[Job]:
+    """Load jobs from a directory of ``*.elf`` files, or from a JSON-lines manifest of jobs.
+
+    Keys missing from a job are taken from ``defaults``. Relative paths in a manifest are resolved against the directory
+    containing it.
+    """
+    defaults = defaults or {}
+    if path.is_dir():
+        return [
+            Job.from_dict({**defaults, 'id': elf_file.stem, 'elf': elf_file}) for elf_file in sorted(path.glob('*.elf'))
+        ]
+
+    res = []
+    with path.open() as f:
+        for line in f:
+            if not line.strip():
+                continue
+            res.append(Job.from_dict({**defaults, **json.loads(line)}, base_dir=path.parent))
+    return res
+
+
+def run_batch(tools: Tools, jobs: Iterable[Job], *, processes: int | None = None) -> Iterator[dict[str, Any]]:
+    """Execute jobs on a pool of forked workers that share the already loaded ``tools``.
+
+    Results are yielded in completion order. A failing job yields ``{"id": ..., "elf": ..., "error": ...}``.
+    """
+    global _TOOLS
+
+    tools.krun.definition.init_config(sort=GENERATED_TOP_CELL)
+    _TOOLS = tools
+    try:
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            yield from pool.imap_unordered(_run_job, jobs)
+    finally:
+        _TOOLS = None
+
+
+def _run_job(job: Job) -> dict[str, Any]:
+    assert _TOOLS is not None
+    # Diagnostics of concurrent workers would interleave, so they are captured and logged per job instead
+    output = StringIO()
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            result = run_job(_TOOLS, job)
+    except Exception as err:
+        _LOGGER.error(f'{job.elf_file}: {err}\n{output.getvalue()}')
+        return {'id': job.id, 'elf': str(job.elf_file), 'error': str(err)}
+    return {**result.to_dict(), 'elf': str(job.elf_file)}
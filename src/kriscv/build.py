@@ -16,5 +16,45 @@ importer.import_kllvm(kdist.get('riscv-semantics.kllvm'))
 runtime: Final = importer.import_runtime(kdist.get('riscv-semantics.kllvm-runtime'))
 
 
-def semantics(*, temp_dir: Path | None = None) -> Tools:
-    return Tools(definition_dir=kdist.get('riscv-semantics.llvm'), temp_dir=temp_dir)
+def semantics(
+    *,
+    temp_dir: Path | None = None,
+    in_process: bool = False,
+    binary_kore: bool = False,
+    fused: bool = False,
+    blocks: bool = False,
+) -> Tools:
+    if in_process and fused:
+        raise ValueError('In-process execution is not supported for the fused semantics')
+    if in_process and blocks:
+        raise ValueError('In-process execution is not supported for the basic-block semantics')
+    if fused and blocks:
+        raise ValueError('The basic-block semantics already executes fused instructions')
+    if blocks:
+        target = 'riscv-semantics.llvm-blocks'
+    elif fused:
+        target = 'riscv-semantics.llvm-fused'
+    else:
+        target = 'riscv-semantics.llvm'
+    return Tools(
+        definition_dir=kdist.get(target),
+        runtime=runtime if in_process else None,
+        binary_kore=binary_kore,
+        temp_dir=temp_dir,
+    )
+
+
+def specialized_semantics(
+    elf_file: Path,
+    *,
+    temp_dir: Path | None = None,
+    binary_kore: bool = False,
+) -> Tools:
+    """The concrete semantics specialized to ``elf_file``, kompiled by ``specialize`` on first use."""
+    from .specialize import specialize
+
+    return Tools(
+        definition_dir=specialize(elf_file),
+        binary_kore=binary_kore,
+        temp_dir=temp_dir,
+    )
@@ -1,4 +1,12 @@
+from __future__ import annotations
+
 import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pyk.kore.syntax import Pattern
 
 
 def kriscv_asm() -> None:
@@ -16,3 +24,109 @@ def kriscv_asm() -> None:
     binary_int = int(binary_str, 2)
     little_endian_bytes = binary_int.to_bytes(4, byteorder='little')
     print(''.join(f'\\x{b:02x}' for b in little_endian_bytes))
+
+
+def kriscv_bench_kore() -> None:
+    """
+    Compare the text and binary Kore formats on initial configurations with increasingly large memory images.
+
+    For each memory size in KiB (default: 64, 1024, 4096), an initial configuration is built for a synthetic ELF
+    with the given amount of random data, and the size, serialization time, and parse time are reported for both formats.
+
+    Usage:
+        kriscv-bench-kore [<size-kib> ...]
+    """
+    import random
+
+    from . import build
+    from .elf_parser import ELF
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [64, 1024, 4096]
+    tools = build.semantics()
+
+    print(f'{"memory":>10} {"format":>6} {"size":>12} {"serialize":>10} {"parse":>10}')
+    for size in sizes:
+        data = random.Random(size).randbytes(size * 1024)
+        elf = ELF(entry_point=0x1000, memory={0x1000: data}, symbols={})
+        config = tools.kore_config_from_elf(elf)
+        for fmt, length, ser_time, parse_time in _bench_kore(config):
+            print(f'{size:>7}KiB {fmt:>6} {length:>12} {ser_time:>9.3f}s {parse_time:>9.3f}s')
+
+
+def _bench_kore(config: Pattern) -> list[tuple[str, int, float, float]]:
+    """Time serializing ``config`` and parsing it back into a ``Pattern``, the same way ``Tools`` parses the output."""
+    from time import perf_counter
+
+    from pyk.kllvm.ast import Pattern as LLVMPattern
+    from pyk.kllvm.convert import llvm_to_pattern, pattern_to_llvm
+    from pyk.kore.parser import KoreParser
+
+    start = perf_counter()
+    text = config.text
+    text_ser = perf_counter() - start
+
+    start = perf_counter()
+    KoreParser(text).pattern()
+    text_parse = perf_counter() - start
+
+    start = perf_counter()
+    binary = pattern_to_llvm(config).serialize()
+    binary_ser = perf_counter() - start
+
+    start = perf_counter()
+    llvm_to_pattern(LLVMPattern.deserialize(binary))
+    binary_parse = perf_counter() - start
+
+    return [
+        ('text', len(text.encode()), text_ser, text_parse),
+        ('binary', len(binary), binary_ser, binary_parse),
+    ]
+
+
+def kriscv_bench_memory() -> None:
+    """
+    Time the memory functions of the semantics with the microbenchmarks of the ``func-test`` target.
+
+    For each access width of 1, 2, and 4 bytes, a read and a write is repeated ``count`` times (default: 100000),
+    both on memory with a single segment and on memory fragmented into 1000 segments, accessing the last segment.
+
+    Usage:
+        kriscv-bench-memory [<count>]
+    """
+    from pyk.kdist import kdist
+    from pyk.kore.prelude import SORT_K_ITEM, generated_counter, generated_top, inj, int_dv, k, kseq
+    from pyk.kore.syntax import App, SortApp
+
+    from . import kore_builder as kb
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    definition_dir = kdist.get('riscv-semantics.func-test')
+
+    layouts: dict[str, list[int | bytes]] = {
+        'single': [bytes(4096)],
+        'fragmented': [item for _ in range(1000) for item in (bytes(4), 32)][:-1],
+    }
+
+    print(f'{"memory":>10} {"op":>5} {"bytes":>5} {"time":>10} {"per access":>12}')
+    for name, items in layouts.items():
+        sbs = kb.sparse_bytes(items)
+        index = sum(len(item) if isinstance(item, bytes) else item for item in items) - 4
+        for op, symbol, sort in [
+            ('read', 'LblbenchReadBytes', SortApp('SortInt')),
+            ('write', 'LblbenchWriteBytes', kb.SORT_SPARSE_BYTES),
+        ]:
+            for num_bytes in [1, 2, 4]:
+                app = App(symbol, (), (int_dv(count), int_dv(index), int_dv(num_bytes), sbs))
+                config = generated_top((k(kseq((inj(sort, SORT_K_ITEM, app),))), generated_counter(int_dv(0))))
+                elapsed = _time_interpret(definition_dir, config)
+                print(f'{name:>10} {op:>5} {num_bytes:>5} {elapsed:>9.3f}s {elapsed / count * 1e9:>10.0f}ns')
+
+
+def _time_interpret(definition_dir: Path, config: Pattern) -> float:
+    from time import perf_counter
+
+    from pyk.ktool.krun import llvm_interpret
+
+    start = perf_counter()
+    llvm_interpret(definition_dir, config)
+    return perf_counter() - start
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, NamedTuple, final
@@ -23,6 +24,7 @@ class ELF:
     entry_point: int
     memory: FrozenDict[int, bytes]
     symbols: FrozenDict[str, tuple[Symbol, ...]]
+    code: tuple[int, ...]
 
     def __init__(
         self,
@@ -30,12 +32,18 @@ class ELF:
         entry_point: int,
         memory: Mapping[int, bytes],
         symbols: Mapping[str, Iterable[tuple[int, int]]],
+        code: Iterable[int] = (),
     ):
         memory = FrozenDict(memory)
         symbols = FrozenDict((name, tuple(Symbol(*symbol) for symbol in symbols)) for name, symbols in symbols.items())
+        code = tuple(sorted(code))
+        for addr in code:
+            if addr not in memory:
+                raise ValueError(f'Executable segment not in memory: {addr}')
         object.__setattr__(self, 'entry_point', entry_point)
         object.__setattr__(self, 'memory', memory)
         object.__setattr__(self, 'symbols', symbols)
+        object.__setattr__(self, 'code', code)
 
     @staticmethod
     def load(file: str | Path) -> ELF:
@@ -50,6 +58,7 @@ class ELF:
                 entry_point=ELF._entry_point(elf),
                 memory=ELF._memory(elf),
                 symbols=ELF._symbols(elf),
+                code=ELF._code(elf),
             )
 
     @staticmethod
@@ -64,10 +73,22 @@ class ELF:
                 start = seg['p_vaddr']
                 file_size = seg['p_filesz']
                 mem_size = seg['p_memsz']
-                data = seg.data() + b'\0' * (mem_size - file_size)
+                data = seg.data()
+                if mem_size > file_size:
+                    data += bytes(mem_size - file_size)
                 res[start] = data
         return res
 
+    @staticmethod
+    def _code(elf: ELFFile) -> list[int]:
+        from elftools.elf.constants import P_FLAGS
+
+        return [
+            seg['p_vaddr']
+            for seg in elf.iter_segments()
+            if seg['p_type'] == 'PT_LOAD' and seg['p_flags'] & P_FLAGS.PF_X
+        ]
+
     @staticmethod
     def _symbols(elf: ELFFile) -> dict[str, list[Symbol]]:
         from elftools.elf.sections import SymbolTableSection
@@ -88,6 +109,25 @@ class ELF:
             )
         return res
 
+    def instructions(self, memory: Mapping[int, bytes] | None = None) -> dict[int, int]:
+        """Map the address of each 32-bit word in an executable segment to its value, read in little-endian order.
+
+        If ``memory`` is given, the words are read from it instead, e.g., after patching the memory of the ELF file with
+        ``patch_memory``. Each executable segment must then be contained in a single segment of ``memory``.
+        """
+        seg_starts = sorted(memory) if memory is not None else []
+        res: dict[int, int] = {}
+        for start in self.code:
+            size = len(self.memory[start])
+            if memory is None:
+                base, data = start, self.memory[start]
+            else:
+                base = seg_starts[bisect_right(seg_starts, start) - 1]
+                data = memory[base]
+            for offset in range(start - base, start - base + size - 3, 4):
+                res[base + offset] = int.from_bytes(data[offset : offset + 4], 'little')
+        return res
+
     def unique_symbol(self, name: str, *, error_loc: str | None = None) -> Symbol:
         error_loc = f'{error_loc}: ' if error_loc else ''
         symbols = self.symbols.get(name, ())
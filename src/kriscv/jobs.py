@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, final
+
+from pyk.utils import FrozenDict
+
+from . import memory as mem
+from .elf_parser import ELF
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from .memory import Segment
+    from .tools import Tools
+
+
+@final
+@dataclass(frozen=True)
+class Job:
+    """A request to execute a single ELF file.
+
+    The JSON representation of a job is an object of the form
+    ``{"id": ..., "elf": "test.elf", "end_symbol": "_halt", "regs": {"1": 0}, "depth": null, "memory": [[start, end]]}``,
+    where every key other than ``elf`` is optional. Set ``"max_instrs"`` to halt after a number of retired instructions,
+    which, unlike ``depth``, does not depend on the number of rewrite steps per instruction. Set ``"signature": true`` to extract the architectural test
+    signature region, or ``"signature_file": "test.signature"`` to also write it to a file. Set ``"diff": true`` to
+    report every memory range that differs from the memory image of the ELF file.
+    """
+
+    elf_file: Path
+    id: Any
+    end_symbol: str | None
+    regs: FrozenDict[int, int]
+    depth: int | None
+    max_instrs: int | None
+    memory: tuple[tuple[int, int], ...]
+    signature: bool
+    signature_file: Path | None
+    diff: bool
+
+    def __init__(
+        self,
+        *,
+        elf_file: str | Path,
+        id: Any = None,
+        end_symbol: str | None = None,
+        regs: Mapping[int, int] | None = None,
+        depth: int | None = None,
+        max_instrs: int | None = None,
+        memory: Iterable[tuple[int, int]] = (),
+        signature: bool = False,
+        signature_file: str | Path | None = None,
+        diff: bool = False,
+    ):
+        object.__setattr__(self, 'elf_file', Path(elf_file))
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'end_symbol', end_symbol)
+        object.__setattr__(self, 'regs', FrozenDict(regs or {}))
+        object.__setattr__(self, 'depth', depth)
+        object.__setattr__(self, 'max_instrs', max_instrs)
+        object.__setattr__(self, 'memory', tuple((start, end) for start, end in memory))
+        object.__setattr__(self, 'signature', signature or signature_file is not None)
+        object.__setattr__(self, 'signature_file', Path(signature_file) if signature_file is not None else None)
+        object.__setattr__(self, 'diff', diff)
+
+    @staticmethod
+    def from_dict(dct: Mapping[str, Any], *, base_dir: Path | None = None) -> Job:
+        if 'elf' not in dct:
+            raise ValueError(f"Missing key 'elf' in job: {dict(dct)}")
+        elf_file = Path(dct['elf'])
+        signature_file = Path(dct['signature_file']) if dct.get('signature_file') is not None else None
+        if base_dir is not None:
+            elf_file = base_dir / elf_file
+            signature_file = base_dir / signature_file if signature_file is not None else None
+        return Job(
+            elf_file=elf_file,
+            id=dct.get('id'),
+            end_symbol=dct.get('end_symbol'),
+            regs={int(reg): int(val) for reg, val in dct.get('regs', {}).items()},
+            depth=dct.get('depth'),
+            max_instrs=dct.get('max_instrs'),
+            memory=[(int(start), int(end)) for start, end in dct.get('memory', [])],
+            signature=bool(dct.get('signature', False)),
+            signature_file=signature_file,
+            diff=bool(dct.get('diff', False)),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'id': self.id,
+            'elf': str(self.elf_file),
+            'end_symbol': self.end_symbol,
+            'regs': {str(reg): val for reg, val in self.regs.items()},
+            'depth': self.depth,
+            'max_instrs': self.max_instrs,
+            'memory': [[start, end] for start, end in self.memory],
+            'signature': self.signature,
+            'signature_file': str(self.signature_file) if self.signature_file is not None else None,
+            'diff': self.diff,
+        }
+
+
+@final
+@dataclass(frozen=True)
+class JobResult:
+    id: Any
+    regs: FrozenDict[int, int]
+    memory: tuple[tuple[int, int, str], ...]
+    halted: bool
+    signature: tuple[str, ...] | None
+    diff: tuple[tuple[int, str], ...] | None
+    time: float | None
+
+    def __init__(
+        self,
+        *,
+        id: Any,
+        regs: Mapping[int, int],
+        memory: Iterable[tuple[int, int, str]],
+        halted: bool,
+        signature: Iterable[str] | None = None,
+        diff: Iterable[tuple[int, str]] | None = None,
+        time: float | None = None,
+    ):
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'regs', FrozenDict(regs))
+        object.__setattr__(self, 'memory', tuple(memory))
+        object.__setattr__(self, 'halted', halted)
+        object.__setattr__(self, 'signature', tuple(signature) if signature is not None else None)
+        object.__setattr__(self, 'diff', tuple(diff) if diff is not None else None)
+        object.__setattr__(self, 'time', time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'id': self.id,
+            'regs': {str(reg): val for reg, val in sorted(self.regs.items())},
+            'memory': [{'start': start, 'end': end, 'data': data} for start, end, data in self.memory],
+            'halted': self.halted,
+            'signature': list(self.signature) if self.signature is not None else None,
+            'diff': [{'start': start, 'data': data} for start, data in self.diff] if self.diff is not None else None,
+            'time': self.time,
+        }
+
+
+def run_job(tools: Tools, job: Job) -> JobResult:
+    start_time = perf_counter()
+
+    elf = ELF.load(job.elf_file)
+    init_config = tools.kore_config_from_elf(
+        elf, regs=dict(job.regs), end_symbol=job.end_symbol, max_instrs=job.max_instrs
+    )
+    final_state = tools.run(init_config, depth=job.depth)
+    segments = final_state.segments()
+
+    sig: list[str] | None = None
+    if job.signature:
+        sig = signature(elf, segments, error_loc=str(job.elf_file))
+        if job.signature_file is not None:
+            job.signature_file.write_text(''.join(word + '\n' for word in sig))
+
+    diff: list[tuple[int, str]] | None = None
+    if job.diff:
+        diff = [(start, data.hex()) for start, data in mem.diff(elf.memory, segments)]
+
+    return JobResult(
+        id=job.id,
+        regs=final_state.registers(),
+        memory=[(start, end, hex_range(segments, start, end)) for start, end in job.memory],
+        halted=final_state.halted,
+        signature=sig,
+        diff=diff,
+        time=perf_counter() - start_time,
+    )
+
+
+def signature(elf: ELF, segments: Sequence[Segment], *, error_loc: str | None = None) -> list[str]:
+    """Extract the architectural test signature, as a list of 32-bit hexadecimal words."""
+    begin_sig_addr = elf.unique_symbol('begin_signature', error_loc=error_loc).addr
+    end_sig_addr = elf.unique_symbol('end_signature', error_loc=error_loc).addr
+
+    if begin_sig_addr % 4 != 0:
+        raise AssertionError(
+            f'Signature region must begin at an XLEN-bit boundary, but begins at address 0x{begin_sig_addr:08X}.'
+        )
+    if (end_sig_addr - begin_sig_addr) % 4 != 0:
+        raise AssertionError(
+            f'Signature region must contain a series 32-bit words, but spans addresses 0x{begin_sig_addr:08X}-0x{end_sig_addr:08X}.'
+        )
+
+    merged_sig = [_byte_to_hex(byte) for byte in mem.read(segments, begin_sig_addr, end_sig_addr)]
+    return [''.join(reversed(merged_sig[i : i + 4])) for i in range(0, len(merged_sig), 4)]
+
+
+def hex_range(segments: Sequence[Segment], start: int, end: int) -> str:
+    """Render the bytes in ``[start, end)`` as hexadecimal, using ``--`` for bytes that were never written."""
+    return ''.join(_byte_to_hex(byte) for byte in mem.read(segments, start, end))
+
+
+def _byte_to_hex(byte: int | None) -> str:
+    return f'{byte:02x}' if byte is not None else '--'
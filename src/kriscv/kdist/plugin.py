@@ -73,6 +73,23 @@ class KLLVMRuntimeTarget(Target):
         }
 
 
+def specialized_target(main_file: Path, main_module: str) -> KompileTarget:
+    """A target for a module generated by ``kriscv specialize``, kompiled on top of the concrete semantics.
+
+    Unlike the targets below, it is not registered in ``__TARGETS__``, as it depends on the program being specialized.
+    """
+    return KompileTarget(
+        lambda src_dir: {
+            'main_file': main_file,
+            'main_module': main_module,
+            'include_dirs': [src_dir],
+            'syntax_module': 'RISCV',
+            'md_selector': 'k & ! symbolic',
+            'warnings_to_errors': True,
+        },
+    )
+
+
 __TARGETS__: Final = {
     'source': SourceTarget(),
     'llvm': KompileTarget(
@@ -80,7 +97,25 @@ __TARGETS__: Final = {
             'main_file': src_dir / 'riscv-semantics/riscv.md',
             'include_dirs': [src_dir],
             'syntax_module': 'RISCV',
-            'md_selector': 'k',
+            'md_selector': 'k & ! symbolic',
+            'warnings_to_errors': True,
+        },
+    ),
+    'llvm-fused': KompileTarget(
+        lambda src_dir: {
+            'main_file': src_dir / 'riscv-semantics/riscv-fused.md',
+            'include_dirs': [src_dir],
+            'syntax_module': 'RISCV',
+            'md_selector': 'k & ! symbolic',
+            'warnings_to_errors': True,
+        },
+    ),
+    'llvm-blocks': KompileTarget(
+        lambda src_dir: {
+            'main_file': src_dir / 'riscv-semantics/riscv-blocks.md',
+            'include_dirs': [src_dir],
+            'syntax_module': 'RISCV',
+            'md_selector': 'k & ! symbolic',
             'warnings_to_errors': True,
         },
     ),
@@ -90,7 +125,7 @@ __TARGETS__: Final = {
             'include_dirs': [src_dir],
             'syntax_module': 'RISCV',
             'llvm_kompile_type': LLVMKompileType.C,
-            'md_selector': 'k',
+            'md_selector': 'k & ! concrete',
             'warnings_to_errors': True,
         },
     ),
@@ -100,7 +135,7 @@ __TARGETS__: Final = {
             'backend': PykBackend.HASKELL,
             'include_dirs': [src_dir],
             'syntax_module': 'RISCV',
-            'md_selector': 'k',
+            'md_selector': 'k & ! concrete',
             'warnings_to_errors': True,
         },
     ),
@@ -109,7 +144,7 @@ __TARGETS__: Final = {
             'main_file': src_dir / 'riscv-semantics/func-test.md',
             'include_dirs': [src_dir],
             'syntax_module': 'FUNC-TEST',
-            'md_selector': 'k',
+            'md_selector': 'k & ! symbolic',
             'warnings_to_errors': True,
         },
     ),
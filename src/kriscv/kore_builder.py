@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyk.kore.prelude import (
+    INT,
+    LBL_LIST,
+    LBL_LIST_ITEM,
+    LBL_MAP,
+    LBL_MAP_ITEM,
+    LBL_SET,
+    LBL_SET_ITEM,
+    SORT_K_ITEM,
+    STOP_LIST,
+    STOP_MAP,
+    STOP_SET,
+    bytes_dv,
+    inj,
+    int_dv,
+)
+from pyk.kore.syntax import App, SortApp
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from typing import Final
+
+    from pyk.kore.syntax import Pattern
+
+
+SORT_SPARSE_BYTES: Final = SortApp('SortSparseBytes')
+SORT_SPARSE_BYTES_EF: Final = SortApp('SortSparseBytesEF')
+SORT_SPARSE_BYTES_BF: Final = SortApp('SortSparseBytesBF')
+SORT_INSTRUCTION: Final = SortApp('SortInstruction')
+
+
+def halt_never() -> Pattern:
+    return App('LblHaltNever')
+
+
+def halt_at_address(address: Pattern) -> Pattern:
+    return App('LblHaltAtAddress', (), (address,))
+
+
+def halt_at_addresses(addresses: Iterable[Pattern]) -> Pattern:
+    return App('LblHaltAtAddresses', (), (set_of(addresses),))
+
+
+def halt_at_instret(count: Pattern) -> Pattern:
+    return App('LblHaltAtInstret', (), (count,))
+
+
+def halt_at_env_call() -> Pattern:
+    return App('LblHaltAtEnvCall')
+
+
+def halt_any(*conds: Pattern) -> Pattern:
+    if not conds:
+        return halt_never()
+    res = conds[-1]
+    for cond in reversed(conds[:-1]):
+        res = App('LblHaltAny', (), (cond, res))
+    return res
+
+
+def halt(addresses: Iterable[int] = (), *, max_instrs: int | None = None, env_call: bool = False) -> Pattern:
+    """Same as ``term_builder.halt``, but building the halt condition directly in Kore."""
+    addrs = sorted(set(addresses))
+    conds = []
+    if len(addrs) == 1:
+        conds.append(halt_at_address(word(addrs[0])))
+    elif addrs:
+        conds.append(halt_at_addresses(inj(INT, SORT_K_ITEM, word(addr)) for addr in addrs))
+    if max_instrs is not None:
+        conds.append(halt_at_instret(int_dv(max_instrs)))
+    if env_call:
+        conds.append(halt_at_env_call())
+    return halt_any(*conds)
+
+
+def word(bits: int) -> Pattern:
+    assert bits >= 0
+    return int_dv(bits)
+
+
+def map_of(items: Iterable[tuple[Pattern, Pattern]]) -> Pattern:
+    # Same as map_pattern from pyk.kore.prelude, but not using LeftAssoc
+    result: Pattern | None = None
+    for key, value in items:
+        item = App(LBL_MAP_ITEM, (), (key, value))
+        result = item if result is None else App(LBL_MAP, (), (result, item))
+    return result if result is not None else STOP_MAP
+
+
+def set_of(items: Iterable[Pattern]) -> Pattern:
+    # Same as set_pattern from pyk.kore.prelude, but not using LeftAssoc
+    result: Pattern | None = None
+    for elem in items:
+        item = App(LBL_SET_ITEM, (), (elem,))
+        result = item if result is None else App(LBL_SET, (), (result, item))
+    return result if result is not None else STOP_SET
+
+
+def list_of(items: Iterable[Pattern]) -> Pattern:
+    # Same as list_pattern from pyk.kore.prelude, but not using LeftAssoc
+    result: Pattern | None = None
+    for elem in items:
+        item = App(LBL_LIST_ITEM, (), (elem,))
+        result = item if result is None else App(LBL_LIST, (), (result, item))
+    return result if result is not None else STOP_LIST
+
+
+def regs(dct: Mapping[int, int]) -> Pattern:
+    """The initial register values, as expected by ``$REGS``. On concrete execution, they are turned into a ``List``."""
+    return map_of((inj(INT, SORT_K_ITEM, int_dv(k)), inj(INT, SORT_K_ITEM, word(v))) for k, v in dct.items())
+
+
+def reg_file(dct: Mapping[int, int]) -> Pattern:
+    """The ``List`` of all ``32`` registers that ``initRegs`` builds from ``regs(dct)`` on concrete execution."""
+    uninit = App("Lbl'Hash'uninit")
+    return list_of(inj(INT, SORT_K_ITEM, word(dct[reg])) if reg in dct else uninit for reg in range(32))
+
+
+def disassemble(instr: Pattern) -> Pattern:
+    return App('Lbldisassemble', (), (instr,))
+
+
+def icache(dct: Mapping[int, int]) -> Pattern:
+    """Build an instruction cache, mapping each address to the disassembly of the instruction stored there."""
+    return map_of(
+        (inj(INT, SORT_K_ITEM, int_dv(addr)), inj(SORT_INSTRUCTION, SORT_K_ITEM, disassemble(int_dv(instr))))
+        for addr, instr in dct.items()
+    )
+
+
+def dot_sb() -> Pattern:
+    return App("Lbl'Stop'SparseBytes")
+
+
+def sb_empty(count: Pattern) -> Pattern:
+    return App("LblSparseBytes'ColnHash'empty", (), (count,))
+
+
+def sb_bytes(bs: Pattern) -> Pattern:
+    return App("LblSparseBytes'ColnHash'bytes", (), (bs,))
+
+
+def sb_empty_cons(empty: Pattern, rest_bf: Pattern) -> Pattern:
+    return App("LblSparseBytes'Coln'EmptyCons", (), (empty, rest_bf))
+
+
+def sb_bytes_cons(bs: Pattern, rest_ef: Pattern) -> Pattern:
+    return App("LblSparseBytes'Coln'BytesCons", (), (bs, rest_ef))
+
+
+def sparse_bytes(items: Iterable[int | bytes]) -> Pattern:
+    """Build a ``SparseBytes`` term from alternating gap sizes and data, in ascending address order."""
+    result = dot_sb()
+    is_bf = False
+    for item in reversed(list(items)):
+        if isinstance(item, int):
+            result = sb_empty_cons(sb_empty(int_dv(item)), result)
+            is_bf = False
+        else:
+            result = sb_bytes_cons(sb_bytes(bytes_dv(item)), result)
+            is_bf = True
+    return inj(SORT_SPARSE_BYTES_BF if is_bf else SORT_SPARSE_BYTES_EF, SORT_SPARSE_BYTES, result)
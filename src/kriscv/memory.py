@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from typing import Final
+
+
+Segment = tuple[int, memoryview]
+"""A contiguous range of initialized memory, given by its start address and contents."""
+
+_CHUNK_SIZE: Final = 64
+
+
+def segments(memory: Mapping[int, bytes]) -> list[Segment]:
+    """Convert a ``{address: bytes}`` dictionary into a list of segments in ascending address order, without copying."""
+    return [(addr, memoryview(data)) for addr, data in sorted(memory.items())]
+
+
+def read(segs: Sequence[Segment], start: int, end: int) -> list[int | None]:
+    """Read the bytes in ``[start, end)``, using ``None`` for bytes that are not initialized.
+
+    Segments must be in ascending address order and non-overlapping.
+    """
+    res: list[int | None] = [None] * (end - start)
+    idx = max(bisect_right(segs, start, key=lambda seg: seg[0]) - 1, 0)
+    for addr, data in segs[idx:]:
+        if addr >= end:
+            break
+        lo = max(start, addr)
+        hi = min(end, addr + len(data))
+        if lo < hi:
+            res[lo - start : hi - start] = data[lo - addr : hi - addr].tolist()
+    return res
+
+
+def diff(initial: Mapping[int, bytes], final: Iterable[Segment]) -> list[Segment]:
+    """Return the maximal ranges of ``final`` that differ from ``initial``, e.g., the memory image of an ELF file.
+
+    A byte differs if it is not initialized in ``initial``, or if it is initialized to a different value. Memory is
+    compared in chunks, so the cost of extracting the difference mainly depends on the size of the changed ranges.
+    """
+    init_segs = segments(initial)
+    res: list[Segment] = []
+    for addr, data in final:
+        end = addr + len(data)
+        ranges: list[tuple[int, int]] = []
+        pos = addr
+        idx = max(bisect_right(init_segs, addr, key=lambda seg: seg[0]) - 1, 0)
+        for init_addr, init_data in init_segs[idx:]:
+            if init_addr >= end:
+                break
+            init_end = init_addr + len(init_data)
+            if init_end <= pos:
+                continue
+            lo = max(pos, init_addr)
+            hi = min(end, init_end)
+            if pos < lo:
+                ranges.append((pos, lo))
+            ranges.extend(_diff_ranges(data[lo - addr : hi - addr], init_data[lo - init_addr : hi - init_addr], lo))
+            pos = hi
+        if pos < end:
+            ranges.append((pos, end))
+        res.extend((start, data[start - addr : stop - addr]) for start, stop in _merge_ranges(ranges))
+    return res
+
+
+def _diff_ranges(actual: memoryview, expected: memoryview, base: int) -> Iterator[tuple[int, int]]:
+    for chunk_start in range(0, len(actual), _CHUNK_SIZE):
+        chunk_end = min(chunk_start + _CHUNK_SIZE, len(actual))
+        if actual[chunk_start:chunk_end] == expected[chunk_start:chunk_end]:
+            continue
+        for i in range(chunk_start, chunk_end):
+            if actual[i] != expected[i]:
+                yield base + i, base + i + 1
+
+
+def _merge_ranges(ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    res: list[tuple[int, int]] = []
+    for start, end in ranges:
+        if res and res[-1][1] == start:
+            res[-1] = (res[-1][0], end)
+        else:
+            res.append((start, end))
+    return res
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import TYPE_CHECKING, final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
+    from typing import Any
+
+
+@final
+class Profile:
+    """Wall-clock time spent in each phase of an execution, together with counters describing the execution.
+
+    Both phase times and counters accumulate, so a single profile can cover an execution split into several runs.
+    Samples record how a quantity evolves over such an execution, e.g., the number of memory segments at each checkpoint.
+    """
+
+    _phases: dict[str, float]
+    _counters: dict[str, int]
+    _samples: dict[str, list[int]]
+
+    def __init__(self) -> None:
+        self._phases = {}
+        self._counters = {}
+        self._samples = {}
+
+    @property
+    def phases(self) -> dict[str, float]:
+        return dict(self._phases)
+
+    @property
+    def counters(self) -> dict[str, int]:
+        return dict(self._counters)
+
+    @property
+    def samples(self) -> dict[str, list[int]]:
+        return {name: list(values) for name, values in self._samples.items()}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = self._phases.get(name, 0.0) + perf_counter() - start
+
+    def count(self, name: str, value: int) -> None:
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def sample(self, name: str, value: int) -> None:
+        self._samples.setdefault(name, []).append(value)
+
+    @property
+    def rates(self) -> dict[str, float]:
+        """Rates derived from the counters, namely rewrite steps per retired instruction and instructions per second."""
+        res: dict[str, float] = {}
+        instret = self._counters.get('instret')
+        if not instret:
+            return res
+        if 'steps' in self._counters:
+            res['steps_per_instruction'] = self._counters['steps'] / instret
+        if self._phases.get('interpret'):
+            res['instructions_per_second'] = instret / self._phases['interpret']
+        return res
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'phases': self.phases,
+            'total': sum(self._phases.values()),
+            'counters': self.counters,
+            'samples': self.samples,
+            'rates': self.rates,
+        }
+
+    def pretty(self) -> str:
+        width = max((len(name) for name in [*self._phases, *self._counters, *self._samples]), default=0)
+        lines = ['Phases:']
+        lines.extend(f'  {name:<{width}}  {time:10.3f}s' for name, time in self._phases.items())
+        lines.append(f'  {"total":<{width}}  {sum(self._phases.values()):10.3f}s')
+        lines.append('Counters:')
+        lines.extend(f'  {name:<{width}}  {value:11}' for name, value in self._counters.items())
+        if self._samples:
+            lines.append('Samples:')
+            lines.extend(f'  {name:<{width}}  {" ".join(map(str, values))}' for name, values in self._samples.items())
+        rates = self.rates
+        if rates:
+            width = max(len(name) for name in rates)
+            lines.append('Rates:')
+            lines.extend(f'  {name:<{width}}  {value:13.2f}' for name, value in rates.items())
+        return '\n'.join(lines)
+
+
+def phase(profile: Profile | None, name: str) -> AbstractContextManager[None]:
+    """Time ``name`` in ``profile``, or do nothing if no profile is given."""
+    return profile.phase(name) if profile is not None else nullcontext()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from contextlib import redirect_stdout
+from socketserver import StreamRequestHandler, UnixStreamServer
+from typing import TYPE_CHECKING
+
+from pyk.kast.prelude.k import GENERATED_TOP_CELL
+
+from .jobs import Job, run_job
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from typing import Any, Final, TextIO
+
+    from .tools import Tools
+
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class JobServer:
+    """Execute jobs sent as JSON lines against a definition that is loaded once.
+
+    Every input line holds a single job (see ``Job``), and is answered by a single output line holding either the
+    ``JobResult`` or an object ``{"id": ..., "error": ...}``.
+    """
+
+    _tools: Tools
+
+    def __init__(self, tools: Tools):
+        self._tools = tools
+
+    def warm_up(self) -> None:
+        self._tools.krun.definition.init_config(sort=GENERATED_TOP_CELL)
+
+    def handle(self, line: str) -> dict[str, Any]:
+        job_id = None
+        try:
+            dct = json.loads(line)
+            job_id = dct.get('id')
+            job = Job.from_dict(dct)
+            # Diagnostics printed during execution must not end up in the response stream
+            with redirect_stdout(sys.stderr):
+                result = run_job(self._tools, job)
+        except Exception as err:
+            _LOGGER.exception(f'Job failed: {job_id!r}')
+            return {'id': job_id, 'error': str(err)}
+        return result.to_dict()
+
+    def serve_lines(self, lines: Iterable[str], out: TextIO) -> None:
+        for line in lines:
+            if not line.strip():
+                continue
+            out.write(json.dumps(self.handle(line)) + '\n')
+            out.flush()
+
+    def serve_stdio(self) -> None:
+        self.serve_lines(sys.stdin, sys.stdout)
+
+    def serve_socket(self, path: Path) -> None:
+        job_server = self
+
+        class Handler(StreamRequestHandler):
+            def handle(self) -> None:
+                for raw_line in self.rfile:
+                    line = raw_line.decode()
+                    if not line.strip():
+                        continue
+                    self.wfile.write((json.dumps(job_server.handle(line)) + '\n').encode())
+                    self.wfile.flush()
+
+        with UnixStreamServer(str(path), Handler) as server:
+            _LOGGER.info(f'Listening on {path}')
+            try:
+                server.serve_forever()
+            finally:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from base64 import b64decode, b64encode
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, final
+
+from pyk.kore.parser import KoreParser
+from pyk.utils import FrozenDict
+
+from .term_manip import kore_memory
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from pyk.kore.syntax import Pattern
+
+    from .state import State
+
+
+@final
+@dataclass(frozen=True)
+class Snapshot:
+    """The machine state at an instruction boundary, from which execution can be resumed.
+
+    Attributes:
+        depth: Total number of rewrite steps requested to reach this state, from the initial configuration.
+        pc: Value of the program counter.
+        regs: Values of the initialized registers.
+        memory: Initialized memory segments, as a ``{address: bytes}`` dictionary.
+        halt: The halt condition, in Kore.
+        instret: Number of instructions retired so far.
+    """
+
+    depth: int
+    pc: int
+    regs: FrozenDict[int, int]
+    memory: FrozenDict[int, bytes]
+    halt: Pattern
+    instret: int
+
+    def __init__(
+        self,
+        *,
+        depth: int,
+        pc: int,
+        regs: Mapping[int, int],
+        memory: Mapping[int, bytes],
+        halt: Pattern,
+        instret: int = 0,
+    ):
+        object.__setattr__(self, 'depth', depth)
+        object.__setattr__(self, 'pc', pc)
+        object.__setattr__(self, 'regs', FrozenDict(regs))
+        object.__setattr__(self, 'memory', FrozenDict(memory))
+        object.__setattr__(self, 'halt', halt)
+        object.__setattr__(self, 'instret', instret)
+
+    @staticmethod
+    def from_state(state: State, *, depth: int) -> Snapshot:
+        if not state.at_boundary:
+            raise ValueError('Snapshots can only be taken between instructions')
+        return Snapshot(
+            depth=depth,
+            pc=state.pc,
+            regs={reg: val for reg, val in state.registers().items() if reg != 0},
+            memory=kore_memory(state.cell('mem')),
+            halt=state.halt_condition,
+            instret=state.instret,
+        )
+
+    @staticmethod
+    def from_dict(dct: Mapping[str, Any]) -> Snapshot:
+        return Snapshot(
+            depth=dct['depth'],
+            pc=dct['pc'],
+            regs={int(reg): val for reg, val in dct['regs'].items()},
+            memory={addr: b64decode(data) for addr, data in dct['memory']},
+            halt=KoreParser(dct['halt']).pattern(),
+            instret=dct.get('instret', 0),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'depth': self.depth,
+            'pc': self.pc,
+            'regs': {str(reg): val for reg, val in sorted(self.regs.items())},
+            'memory': [[addr, b64encode(data).decode()] for addr, data in sorted(self.memory.items())],
+            'halt': self.halt.text,
+            'instret': self.instret,
+        }
+
+    @staticmethod
+    def read(path: str | Path) -> Snapshot:
+        return Snapshot.from_dict(json.loads(Path(path).read_text()))
+
+    def write(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()))
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from itertools import pairwise
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate, pairwise
 from typing import TYPE_CHECKING, NamedTuple
 
-from pyk.kast.inner import KInner
-from pyk.kast.prelude.bytes import bytesToken
-from pyk.kast.prelude.kint import eqInt, intToken
+from pyk.kast.inner import KApply, KInner, KToken
+from pyk.kast.prelude.bytes import BYTES, bytesToken, pretty_bytes
+from pyk.kast.prelude.kbool import TRUE
+from pyk.kast.prelude.kint import INT, eqInt, intToken
 from pyk.kast.prelude.ml import mlEqualsTrue
 
 from .term_builder import (
@@ -21,11 +23,37 @@ from .term_builder import (
 from .term_manip import normalize_memory
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Mapping
+    from typing import Final
 
+    from pyk.kore.syntax import Pattern
 
-def _size(data: bytes | int | SymBytes) -> int:
-    if isinstance(data, bytes):
+
+# Labels of the terms built by dot_sb, sb_empty_cons, sb_empty, sb_bytes_cons, sb_bytes, add_bytes and length_bytes
+_DOT_SB: Final = '.SparseBytes'
+_EMPTY_CONS: Final = 'SparseBytes:EmptyCons'
+_EMPTY: Final = 'SparseBytes:#empty'
+_BYTES_CONS: Final = 'SparseBytes:BytesCons'
+_BYTES: Final = 'SparseBytes:#bytes'
+_ADD_BYTES: Final = '_+Bytes__BYTES-HOOKED_Bytes_Bytes_Bytes'
+_LENGTH_BYTES: Final = 'lengthBytes(_)_BYTES-HOOKED_Int_Bytes'
+_EQ_INT: Final = '_==Int_'
+
+
+class SymBytes(NamedTuple):
+    data: KInner
+    size: int
+
+    def constraint(self) -> KInner:
+        return mlEqualsTrue(eqInt(length_bytes(self.data), intToken(self.size)))
+
+
+Item = bytes | memoryview | int | SymBytes
+"""An item of ``SparseBytes``: concrete data, the size of a gap, or symbolic data."""
+
+
+def _size(data: Item) -> int:
+    if isinstance(data, (bytes, memoryview)):
         return len(data)
     elif isinstance(data, int):
         return data
@@ -33,9 +61,7 @@ def _size(data: bytes | int | SymBytes) -> int:
         return data.size
 
 
-def _split(
-    data: bytes | int | SymBytes, offset: int
-) -> tuple[bytes | int | SymBytes | None, bytes | int | SymBytes | None]:
+def _split(data: Item, offset: int) -> tuple[Item | None, Item | None]:
     size = _size(data)
     if offset == 0:
         return None, data
@@ -43,8 +69,10 @@ def _split(
         return data, None
     if 0 < offset < size:
         match data:
-            case bytes():
-                return data[:offset], data[offset:]
+            case bytes() | memoryview():
+                # Slices of a memoryview share the underlying buffer
+                view = memoryview(data)
+                return view[:offset], view[offset:]
             case int():
                 return offset, size - offset
             case SymBytes():
@@ -54,12 +82,63 @@ def _split(
     raise ValueError(f'Offset {offset} is out of bounds for size {size}')
 
 
-class SymBytes(NamedTuple):
-    data: KInner
-    size: int
+def _merge(items: Iterable[Item]) -> list[Item]:
+    """Merge consecutive bytes and consecutive integers, as required by the invariants of ``SparseBytes``.
 
-    def constraint(self) -> KInner:
-        return mlEqualsTrue(eqInt(length_bytes(self.data), intToken(self.size)))
+    This is the only place where concrete data is copied, and each run of consecutive bytes is copied once.
+    """
+    res: list[Item] = []
+    run: list[bytes | memoryview] = []
+    for item in items:
+        if isinstance(item, (bytes, memoryview)):
+            run.append(item)
+            continue
+        if run:
+            res.append(_join(run))
+            run = []
+        if res and isinstance(item, int) and isinstance(res[-1], int):
+            res[-1] += item
+        else:
+            res.append(item)
+    if run:
+        res.append(_join(run))
+    return res
+
+
+def _join(run: list[bytes | memoryview]) -> bytes | memoryview:
+    return run[0] if len(run) == 1 else b''.join(run)
+
+
+def _length_constraint(constraint: KInner) -> tuple[KInner, int] | None:
+    """Return the term and size of a constraint generated by ``SymBytes.constraint``, if it has this form"""
+    match constraint:
+        case KApply(label=label, args=(lhs, KApply(label=eq, args=(KApply(args=(bs,)) as length, KToken() as size)))):
+            if (
+                label.name == '#Equals'
+                and lhs == TRUE
+                and eq.name == _EQ_INT
+                and length.label.name == _LENGTH_BYTES
+                and size.sort == INT
+            ):
+                return bs, int(size.token)
+    return None
+
+
+def _bytes_items(bs: KInner, sizes: Mapping[KInner, int]) -> list[Item]:
+    """Flatten a ``+Bytes`` concatenation into concrete and symbolic items, from left to right"""
+    res: list[Item] = []
+    stack = [bs]
+    while stack:
+        term = stack.pop()
+        if isinstance(term, KApply) and term.label.name == _ADD_BYTES:
+            stack.extend(reversed(term.args))
+        elif isinstance(term, KToken) and term.sort == BYTES:
+            res.append(pretty_bytes(term))
+        elif term in sizes:
+            res.append(SymBytes(term, sizes[term]))
+        else:
+            raise ValueError(f'Unknown size for symbolic bytes: {term}')
+    return res
 
 
 @dataclass
@@ -70,23 +149,42 @@ class SparseBytes:
     Invariants:
     - No consecutive bytes/integers
     - Ascending address order
+
+    Concrete data is kept as ``bytes`` or as read-only ``memoryview`` slices of them, so that splitting a segment does
+    not copy it. The data is only copied into a ``bytes`` object when merging it with adjacent data, or when converting
+    to K or Kore. Since ``memoryview`` compares equal to ``bytes`` with the same contents, both representations can be
+    used interchangeably in comparisons.
+
+    The end offset of each item is indexed in ``_ends``, so ``data`` must not be modified in place.
     """
 
-    data: list[bytes | int | SymBytes]
+    data: list[Item]
+    _ends: list[int] = field(init=False, repr=False, compare=False)
 
-    def __init__(self, data: list[bytes | int | SymBytes]) -> None:
+    def __init__(self, data: list[Item]) -> None:
         self.data = list(data)
+        self._ends = list(accumulate(_size(item) for item in self.data))
+
+    @staticmethod
+    def _indexed(data: list[Item], ends: list[int]) -> SparseBytes:
+        """Create a SparseBytes from items whose end offsets are already known"""
+        res = object.__new__(SparseBytes)
+        res.data = data
+        res._ends = ends
+        return res
 
     @staticmethod
     def from_concrete(data: Mapping[int, bytes]) -> SparseBytes:
-        """Create a SparseBytes from a {address: bytes} dictionary"""
-        clean_data: list[tuple[int, int | bytes]] = sorted(normalize_memory(data).items())
+        """Create a SparseBytes from a {address: bytes} dictionary, without copying the segments"""
+        clean_data: list[tuple[int, int | memoryview]] = [
+            (addr, memoryview(val)) for addr, val in sorted(normalize_memory(data).items())
+        ]
 
         if not clean_data:
             return SparseBytes([])
 
         # Collect all empty gaps between segements
-        gaps: list[tuple[int, int | bytes]] = []
+        gaps: list[tuple[int, int | memoryview]] = []
         start = clean_data[0][0]
         if start != 0:
             gaps.append((0, start))
@@ -109,9 +207,31 @@ class SparseBytes:
 
     @staticmethod
     def from_k(sparse_bytes: KInner, constraints: list[KInner]) -> SparseBytes:
-        # > This will introduce more codes that make it hard to review.
-        # > I want to implement in the next PR.
-        raise NotImplementedError('TODO')
+        """Create a SparseBytes from a KInner and a list of constraints, as generated by ``to_k``
+
+        Symbolic terms within ``#bytes(_)``, possibly concatenated with ``+Bytes``, become ``SymBytes``, whose size is
+        taken from a ``lengthBytes(_) ==Int _`` constraint. Constraints of any other form are ignored.
+        The cons list is traversed once, without recursion, so large memories can be decoded.
+        """
+        sizes = dict(size for size in map(_length_constraint, constraints) if size is not None)
+
+        items: list[Item] = []
+        term = sparse_bytes
+        while not (isinstance(term, KApply) and term.label.name == _DOT_SB):
+            if not (isinstance(term, KApply) and term.label.name in (_EMPTY_CONS, _BYTES_CONS)):
+                raise ValueError(f'Expected a SparseBytes cons list, got: {term}')
+            item, term = term.args
+            if not (isinstance(item, KApply) and item.label.name in (_EMPTY, _BYTES)):
+                raise ValueError(f'Expected a SparseBytes item, got: {item}')
+            (arg,) = item.args
+            if item.label.name == _EMPTY:
+                if not (isinstance(arg, KToken) and arg.sort == INT):
+                    raise ValueError(f'Expected a concrete gap size, got: {arg}')
+                items.append(int(arg.token))
+            else:
+                items.extend(_bytes_items(arg, sizes))
+
+        return SparseBytes(_merge(items))
 
     def to_k(self) -> tuple[KInner, list[KInner]]:
         """Generate a KInner and a list of constraints from a SparseBytes"""
@@ -120,8 +240,8 @@ class SparseBytes:
 
         # Merge consecutive byte-like items
         for item in self.data:
-            if isinstance(item, (bytes, SymBytes)):
-                token = bytesToken(item) if isinstance(item, bytes) else item.data
+            if isinstance(item, (bytes, memoryview, SymBytes)):
+                token = item.data if isinstance(item, SymBytes) else bytesToken(bytes(item))
                 if processed and isinstance(processed[-1], KInner):
                     processed[-1] = add_bytes(processed[-1], token)
                 else:
@@ -140,34 +260,70 @@ class SparseBytes:
 
         return result, [item.constraint() for item in self.data if isinstance(item, SymBytes)]
 
+    def to_kore(self) -> Pattern:
+        """Generate a Kore ``SparseBytes`` pattern from a concrete SparseBytes"""
+        from . import kore_builder
+
+        items: list[int | bytes] = []
+        for item in _merge(self.data):
+            if isinstance(item, SymBytes):
+                raise ValueError(f'Cannot convert symbolic bytes to Kore: {item}')
+            items.append(item if isinstance(item, int) else bytes(item))
+        return kore_builder.sparse_bytes(items)
+
     def which_data(self, addr: int) -> tuple[int, int]:
         """Return the index and offset of the data item that contains the address"""
-        current_addr = 0
-        for i, item in enumerate(self.data):
-            if addr < current_addr + _size(item):
-                return i, addr - current_addr
-            current_addr += _size(item)
-        if current_addr == addr:
-            return len(self.data) - 1, _size(self.data[-1])
+        if self.data and 0 <= addr:
+            idx = bisect_right(self._ends, addr)
+            if idx < len(self.data):
+                return idx, addr - self._start(idx)
+            if addr == self._ends[-1]:
+                return len(self.data) - 1, _size(self.data[-1])
         raise ValueError(f'Address {addr} is out of bounds')
 
+    def _start(self, idx: int) -> int:
+        return self._ends[idx - 1] if idx > 0 else 0
+
     def which_data_slice(self, start: int, end: int) -> tuple[tuple[int, int], tuple[int, int]]:
         """Return the start and end index of the data item that contains the address"""
         return self.which_data(start), self.which_data(end)
 
     def split(self, addr: int) -> tuple[SparseBytes, SparseBytes]:
         """Split the SparseBytes at the address"""
+        if not self.data and addr == 0:
+            return SparseBytes([]), SparseBytes([])
         idx, offset = self.which_data(addr)
         left_item, right_item = _split(self.data[idx], offset)
-        left_data = list(self.data[:idx]) if left_item is None else list(self.data[:idx]) + [left_item]
-        right_data = list(self.data[idx + 1 :]) if right_item is None else [right_item] + list(self.data[idx + 1 :])
-        return SparseBytes(left_data), SparseBytes(right_data)
+        left_data = self.data[:idx]
+        left_ends = self._ends[:idx]
+        if left_item is not None:
+            left_data.append(left_item)
+            left_ends.append(addr)
+        right_start = idx if right_item is not None else idx + 1
+        right_data = self.data[right_start:]
+        right_ends = [end - addr for end in self._ends[right_start:]]
+        if right_item is not None:
+            right_data[0] = right_item
+        return SparseBytes._indexed(left_data, left_ends), SparseBytes._indexed(right_data, right_ends)
 
     def __setitem__(self, addr: slice, value: SparseBytes) -> None:
         """Set a sub-bytes from the address"""
         if len(value) != addr.stop - addr.start:
             raise ValueError(f'Expected length {addr.stop - addr.start}, got {len(value)}')
-        self.data = (self.split(addr.start)[0] + value + self.split(addr.stop)[1]).data
+        if not value.data:
+            return
+        start_idx, start_offset = self.which_data(addr.start)
+        stop_idx, stop_offset = self.which_data(addr.stop)
+        head, _ = _split(self.data[start_idx], start_offset)
+        _, tail = _split(self.data[stop_idx], stop_offset)
+
+        # Only the replaced items and their neighbours can change, and the total length stays the same
+        lo = max(start_idx - 1, 0)
+        hi = min(stop_idx + 2, len(self.data))
+        items = self.data[lo:start_idx] + [head] + value.data + [tail] + self.data[stop_idx + 1 : hi]
+        merged = _merge([item for item in items if item is not None])
+        self.data[lo:hi] = merged
+        self._ends[lo:hi] = list(accumulate((_size(item) for item in merged), initial=self._start(lo)))[1:]
 
     def __getitem__(self, addr: slice) -> SparseBytes:
         """Return a sub-bytes from the address"""
@@ -177,17 +333,12 @@ class SparseBytes:
 
     def __add__(self, other: SparseBytes) -> SparseBytes:
         """Concatenate two SparseBytes"""
-        if self.data == []:
+        if not self.data:
             return SparseBytes(other.data)
-        if other.data == []:
+        if not other.data:
             return SparseBytes(self.data)
-        if isinstance(self.data[-1], int) and isinstance(other.data[0], int):
-            self.data[-1] += other.data[0]
-            return SparseBytes(self.data + other.data[1:])
-        if isinstance(self.data[-1], bytes) and isinstance(other.data[0], bytes):
-            return SparseBytes(self.data[:-1] + [self.data[-1] + other.data[0]] + other.data[1:])
-        return SparseBytes(self.data + other.data)
+        return SparseBytes(self.data[:-1] + _merge([self.data[-1], other.data[0]]) + other.data[1:])
 
     def __len__(self) -> int:
         """Return the length of the SparseBytes"""
-        return sum(_size(item) for item in self.data)
+        return self._ends[-1] if self._ends else 0
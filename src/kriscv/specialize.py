@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from pyk.kdist import kdist
+from pyk.konvert import unmunge
+from pyk.kore.match import kore_int, match_app
+
+from .elf_parser import ELF
+from .term_manip import match_map, strip_inj
+from .tools import Tools
+
+if TYPE_CHECKING:
+    from typing import Final
+
+    from pyk.kore.syntax import App, Pattern
+    from pyk.ktool.kprint import KPrint
+
+
+MODULE_NAME: Final = 'RISCV-SPECIALIZED'
+
+_WORD_MASK: Final = 0xFFFFFFFF
+
+_INSTR_SYMBOLS: Final = ('LblRegRegImmInstr', 'LblRegImmInstr', 'LblRegRegRegInstr', 'LblRegImmRegInstr')
+
+# Instructions whose next PC depends on the registers, or which halt execution instead of retiring
+_DYNAMIC_PC: Final = frozenset(
+    ['BEQ', 'BNE', 'BLT', 'BLTU', 'BGE', 'BGEU', 'JALR', 'ECALL', 'EBREAK', 'INVALID_INSTR'],
+)
+
+
+def cache_key(elf_file: str | Path, source_dir: Path) -> str:
+    """Return the key of the definition specialized to ``elf_file``.
+
+    The key is a SHA-256 digest of ``elf_file``, of the semantics sources in ``source_dir``, and of the K version, so
+    that a definition kompiled against other semantics or by another version of K is never reused.
+    """
+    from pyk.kbuild.utils import k_version
+
+    parts = [Path(elf_file).read_bytes()]
+    for path in sorted(path for path in source_dir.rglob('*') if path.is_file()):
+        parts += [str(path.relative_to(source_dir)).encode(), path.read_bytes()]
+    parts.append(k_version().text.encode())
+
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+def specialize(
+    elf_file: str | Path,
+    *,
+    cache_dir: Path | None = None,
+    force: bool = False,
+    verbose: bool = False,
+) -> Path:
+    """Kompile the concrete semantics specialized to ``elf_file``, and return the definition directory.
+
+    Definitions are cached by ``cache_key``, in ``cache_dir`` if given, and next to the ``kdist`` targets otherwise.
+    A cached definition is reused unless ``force`` is set.
+    """
+    from .kdist.plugin import specialized_target
+
+    elf_file = Path(elf_file)
+    source_dir = kdist.get('riscv-semantics.source')
+    if cache_dir is None:
+        cache_dir = kdist.kdist_dir / 'riscv-semantics' / 'specialized'
+    definition_dir = cache_dir / cache_key(elf_file, source_dir)
+
+    if definition_dir.is_dir():
+        if not force:
+            return definition_dir
+        shutil.rmtree(definition_dir)
+
+    tools = Tools(kdist.get('riscv-semantics.llvm'))
+    module = specialized_module(tools, ELF.load(elf_file))
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with TemporaryDirectory(dir=cache_dir) as build_dir:
+        main_file = Path(build_dir) / 'riscv-specialized.k'
+        main_file.write_text(module)
+        output_dir = Path(build_dir) / 'definition'
+        specialized_target(main_file, MODULE_NAME).build(
+            output_dir,
+            deps={'riscv-semantics.source': source_dir},
+            args={},
+            verbose=verbose,
+        )
+        shutil.copy(main_file, output_dir)
+        output_dir.rename(definition_dir)
+
+    return definition_dir
+
+
+def decode(tools: Tools, elf: ELF) -> dict[int, Pattern]:
+    """Disassemble the instructions in the executable segments of ``elf``.
+
+    The instructions are disassembled by the semantics itself, which populates the ``<icache>`` of the initial
+    configuration.
+    """
+    state = tools.run(tools.kore_config_from_elf(elf), depth=0)
+    return {kore_int(addr): instr for addr, instr in match_map(state.cell('icache'))}
+
+
+def specialized_module(tools: Tools, elf: ELF) -> str:
+    """Generate a K module with one rule per static instruction address of ``elf``.
+
+    Each rule executes the pre-decoded instruction at its address, with the next ``PC`` and the results of ``AUIPC`` and
+    ``JAL`` already resolved. See ``riscv-specialize.md`` for the operations the rules use.
+    """
+    rules = [_rule(tools.kprint, addr, instr) for addr, instr in sorted(decode(tools, elf).items())]
+    lines = [
+        'requires "riscv-semantics/riscv-specialize.md"',
+        '',
+        f'module {MODULE_NAME}',
+        '  imports RISCV-SPECIALIZE',
+        '',
+        *rules,
+        'endmodule',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def _rule(kprint: KPrint, addr: int, instr: Pattern) -> str:
+    instr_text = kprint.pretty_print(kprint.kore_to_kast(instr))
+    steps = ' ~> '.join([*_steps(addr, match_app(instr), instr_text), '#CHECK_HALT'])
+    return (
+        f'  rule <instrs> (.K => {steps}) ~> #EXECUTE ...</instrs>\n'
+        f'       <pc> {addr} </pc>\n'
+        f'       <icache> {addr} |-> ({instr_text}) _ </icache>\n'
+        '    [priority(40)]\n'
+    )
+
+
+def _steps(addr: int, instr: App, instr_text: str) -> list[str]:
+    name = _instr_name(instr)
+    next_pc = (addr + 4) & _WORD_MASK
+
+    if name == 'JAL':
+        rd, offset = (kore_int(strip_inj(arg)) for arg in instr.args[1:])
+        return _write_reg(rd, next_pc) + [f'#RETIRE({(addr + offset) & _WORD_MASK})']
+
+    if name == 'AUIPC':
+        rd, imm = (kore_int(strip_inj(arg)) for arg in instr.args[1:])
+        return _write_reg(rd, (addr + (imm << 12)) & _WORD_MASK) + [f'#RETIRE({next_pc})']
+
+    if name in _DYNAMIC_PC:
+        return [instr_text, f'#PC[ {instr_text} ]']
+
+    return [instr_text, f'#RETIRE({next_pc})']
+
+
+def _write_reg(rd: int, value: int) -> list[str]:
+    return [f'#WRITE_REG({rd}, {value})'] if rd != 0 else []
+
+
+def _instr_name(instr: App) -> str:
+    app = match_app(strip_inj(instr.args[0])) if instr.symbol in _INSTR_SYMBOLS else instr
+    return unmunge(app.symbol[3:])
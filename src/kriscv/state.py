@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING, final
+
+from pyk.konvert import unmunge
+from pyk.kore.match import kore_int, match_app
+from pyk.kore.syntax import App, Assoc
+
+from . import memory
+from .term_manip import kore_memory, kore_registers, strip_inj
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from pyk.kast import KInner
+    from pyk.kore.syntax import Pattern
+    from pyk.ktool.kprint import KPrint
+
+
+@final
+class State:
+    """A configuration of the semantics, kept in Kore.
+
+    Cells are located by walking the Kore pattern directly, and the pattern is only converted to KAST on demand.
+    """
+
+    _pattern: Pattern
+    _kprint: KPrint | None
+
+    def __init__(self, pattern: Pattern, *, kprint: KPrint | None = None):
+        self._pattern = pattern
+        self._kprint = kprint
+
+    @property
+    def pattern(self) -> Pattern:
+        return self._pattern
+
+    @cached_property
+    def cells(self) -> dict[str, Pattern]:
+        """Map the name of each leaf cell, e.g. ``regs``, to its contents."""
+        res: dict[str, Pattern] = {}
+        stack: list[Pattern] = [self._pattern]
+        while stack:
+            pattern = stack.pop()
+            if not isinstance(pattern, App):
+                continue
+            name = _cell_name(pattern)
+            if name is None:
+                continue
+            subcells = [arg for arg in pattern.args if isinstance(arg, App) and _cell_name(arg) is not None]
+            if subcells:
+                stack.extend(subcells)
+            elif len(pattern.args) == 1:
+                res[name] = pattern.args[0]
+        return res
+
+    def cell(self, name: str) -> Pattern:
+        if name not in self.cells:
+            raise ValueError(f'Cell not found: <{name}>')
+        return self.cells[name]
+
+    @cached_property
+    def kast(self) -> KInner:
+        if self._kprint is None:
+            raise ValueError('Converting to KAST requires a KPrint instance')
+        return self._kprint.kore_to_kast(self._pattern)
+
+    @property
+    def pc(self) -> int:
+        return kore_int(self.cell('pc'))
+
+    @property
+    def instret(self) -> int:
+        """The number of retired instructions."""
+        return kore_int(self.cell('instret'))
+
+    @property
+    def halt_condition(self) -> Pattern:
+        return self.cell('haltCond')
+
+    @property
+    def halted(self) -> bool:
+        return self._next_op() == "Lbl'Hash'HALT"
+
+    @property
+    def at_boundary(self) -> bool:
+        """Whether the state lies between two instructions, i.e., the next operation is to fetch an instruction."""
+        return self._next_op() == "Lbl'Hash'EXECUTE"
+
+    def _next_op(self) -> str | None:
+        instrs = self.cell('instrs')
+        if isinstance(instrs, Assoc):
+            instrs = instrs.app
+        if not isinstance(instrs, App) or instrs.symbol != 'kseq':
+            return None
+        return match_app(strip_inj(instrs.args[0])).symbol
+
+    def registers(self) -> dict[int, int]:
+        return kore_registers(self.cell('regs'))
+
+    def segments(self) -> list[memory.Segment]:
+        """Return the initialized memory as a list of ``(address, data)`` segments in ascending address order."""
+        return memory.segments(kore_memory(self.cell('mem')))
+
+    def diff(self, initial: Mapping[int, bytes]) -> list[memory.Segment]:
+        """Return the ranges of memory that differ from ``initial``, e.g. the memory image of the executed ELF file."""
+        return memory.diff(initial, self.segments())
+
+    def memory(self) -> dict[int, int]:
+        mem = {}
+        for addr, data in kore_memory(self.cell('mem')).items():
+            for idx, val in enumerate(data):
+                mem[addr + idx] = val
+        return mem
+
+
+def _cell_name(app: App) -> str | None:
+    if not app.symbol.startswith("Lbl'-LT-'") or not app.symbol.endswith("'-GT-'"):
+        return None
+    return unmunge(app.symbol[3:])[1:-1]
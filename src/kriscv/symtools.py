@@ -14,6 +14,7 @@ from pyk.proof.reachability import APRProof
 from pyk.proof.show import APRProofShow
 
 from .kprovex.api import Dist, Plugin
+from .tools import Tools
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
@@ -58,6 +59,11 @@ class SymTools:
     def kprove(self) -> KProve:
         return KProve(definition_dir=self.haskell_dir, use_directory=self.proof_dir, bug_report=self.bug_report)
 
+    @cached_property
+    def tools(self) -> Tools:
+        """Configuration builders over the symbolic definition, for which ``<regs>`` is a ``Map``."""
+        return Tools(self.haskell_dir, temp_dir=self.proof_dir)
+
     @cached_property
     def proof_show(self) -> APRProofShow:
         return _APRProofShow(self.kprove)
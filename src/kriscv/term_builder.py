@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from pyk.kast.inner import KApply, KInner, KSort, KVariable
-from pyk.kast.prelude.collections import map_of
+from pyk.kast.prelude.collections import map_of, set_of
 from pyk.kast.prelude.kint import intToken
 
 if TYPE_CHECKING:
@@ -21,6 +21,42 @@ def halt_at_address(address: KInner) -> KInner:
     return KApply('HaltAtAddress', address)
 
 
+def halt_at_addresses(addresses: Iterable[KInner]) -> KInner:
+    return KApply('HaltAtAddresses', set_of(addresses))
+
+
+def halt_at_instret(count: KInner) -> KInner:
+    return KApply('HaltAtInstret', count)
+
+
+def halt_at_env_call() -> KInner:
+    return KApply('HaltAtEnvCall')
+
+
+def halt_any(*conds: KInner) -> KInner:
+    if not conds:
+        return halt_never()
+    res = conds[-1]
+    for cond in reversed(conds[:-1]):
+        res = KApply('HaltAny', cond, res)
+    return res
+
+
+def halt(addresses: Iterable[int] = (), *, max_instrs: int | None = None, env_call: bool = False) -> KInner:
+    """Build a condition to halt at any of ``addresses``, after ``max_instrs`` retired instructions, or on ``ECALL`` and ``EBREAK``."""
+    addrs = sorted(set(addresses))
+    conds = []
+    if len(addrs) == 1:
+        conds.append(halt_at_address(word(addrs[0])))
+    elif addrs:
+        conds.append(halt_at_addresses(word(addr) for addr in addrs))
+    if max_instrs is not None:
+        conds.append(halt_at_instret(intToken(max_instrs)))
+    if env_call:
+        conds.append(halt_at_env_call())
+    return halt_any(*conds)
+
+
 def disassemble(instr: KInner) -> KInner:
     return KApply('disassemble', instr)
 
@@ -274,7 +310,12 @@ def add_bytes(bytes1: KInner, bytes2: KInner) -> KInner:
 
 
 def sort_memory() -> KSort:
-    return KSort('SparseBytes')
+    # On concrete execution, memory is a map from page addresses to pages
+    return KSort('Map')
+
+
+def init_memory(sb: KInner) -> KInner:
+    return KApply('Memory:initMemory', sb)
 
 
 def load_bytes(mem: KInner, addr: KInner, num_bytes: KInner) -> KInner:
@@ -286,5 +327,11 @@ def store_bytes(mem: KInner, addr: KInner, value: KInner, num_bytes: KInner) ->
 
 
 def regs(dct: dict[int, int]) -> KInner:
+    """The initial register values, as expected by ``$REGS``. On concrete execution, they are turned into a ``List``."""
     regs: dict[KInner, KInner] = {intToken(k): word(v) for k, v in dct.items()}
     return map_of(regs)
+
+
+def icache(dct: dict[int, int]) -> KInner:
+    icache: dict[KInner, KInner] = {intToken(addr): disassemble(intToken(instr)) for addr, instr in dct.items()}
+    return map_of(icache)
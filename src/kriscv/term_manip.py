@@ -6,11 +6,16 @@ from pyk.kore.match import kore_bytes, kore_int, match_app, match_symbol
 from pyk.kore.syntax import App, SortApp
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Iterator, Mapping
+    from typing import Final
 
     from pyk.kore.syntax import Pattern
 
 
+_LIST_SYMBOLS: Final = ("Lbl'Stop'List", "Lbl'Unds'List'Unds'", 'LblListItem')
+_MAP_SYMBOLS: Final = ("Lbl'Stop'Map", "Lbl'Unds'Map'Unds'", "Lbl'UndsPipe'-'-GT-Unds'")
+
+
 def kore_word(word: Pattern) -> int:
     return kore_int(match_app(word, 'LblW').args[0])
 
@@ -21,34 +26,78 @@ def strip_inj(pattern: Pattern) -> Pattern:
     return pattern
 
 
-def match_map(pattern: Pattern) -> tuple[tuple[Pattern, Pattern], ...]:
+def match_map(pattern: Pattern) -> Iterator[tuple[Pattern, Pattern]]:
     # Same as match_map from pyk.kore.match, but not using LeftAssoc and stripping injections
+    # Items are generated in order, using an explicit stack instead of recursion
     stop_symbol = "Lbl'Stop'Map"
     cons_symbol = "Lbl'Unds'Map'Unds'"
     item_symbol = "Lbl'UndsPipe'-'-GT-Unds'"
 
-    app = match_app(pattern)
-    if app.symbol == stop_symbol:
-        return ()
+    stack = [pattern]
+    while stack:
+        app = match_app(stack.pop())
+        if app.symbol == stop_symbol:
+            continue
+
+        if app.symbol == item_symbol:
+            yield strip_inj(app.args[0]), strip_inj(app.args[1])
+            continue
+
+        match_symbol(app.symbol, cons_symbol)
+        stack += (app.args[1], app.args[0])
 
-    if app.symbol == item_symbol:
-        return ((strip_inj(app.args[0]), strip_inj(app.args[1])),)
 
-    match_symbol(app.symbol, cons_symbol)
-    return match_map(app.args[0]) + match_map(app.args[1])
+def match_list(pattern: Pattern) -> Iterator[Pattern]:
+    # Same as match_list from pyk.kore.match, but not using LeftAssoc and stripping injections
+    # Items are generated in order, using an explicit stack instead of recursion
+    stop_symbol = "Lbl'Stop'List"
+    cons_symbol = "Lbl'Unds'List'Unds'"
+    item_symbol = 'LblListItem'
 
+    stack = [pattern]
+    while stack:
+        app = match_app(stack.pop())
+        if app.symbol == stop_symbol:
+            continue
 
-def match_sparse_bytes(pattern: Pattern) -> tuple[Pattern, ...]:
+        if app.symbol == item_symbol:
+            yield strip_inj(app.args[0])
+            continue
+
+        match_symbol(app.symbol, cons_symbol)
+        stack += (app.args[1], app.args[0])
+
+
+def match_sparse_bytes(pattern: Pattern) -> Iterator[Pattern]:
+    """Generate the ``#empty(_)`` and ``#bytes(_)`` items of a ``SparseBytes`` cons list, in ascending address order."""
     app = match_app(pattern)
-    if app.symbol == 'inj' and (
-        app.sorts == (SortApp('SortSparseBytesEF'), SortApp('SortSparseBytes'))
-        or app.sorts == (SortApp('SortSparseBytesBF'), SortApp('SortSparseBytes'))
-    ):
-        app = match_app(app.args[0])
-    if app.symbol == "LblSparseBytes'Coln'EmptyCons" or app.symbol == "LblSparseBytes'Coln'BytesCons":
-        return (app.args[0],) + match_sparse_bytes(app.args[1])
+    while True:
+        if app.symbol == 'inj' and (
+            app.sorts == (SortApp('SortSparseBytesEF'), SortApp('SortSparseBytes'))
+            or app.sorts == (SortApp('SortSparseBytesBF'), SortApp('SortSparseBytes'))
+        ):
+            app = match_app(app.args[0])
+        if app.symbol != "LblSparseBytes'Coln'EmptyCons" and app.symbol != "LblSparseBytes'Coln'BytesCons":
+            break
+        yield app.args[0]
+        app = match_app(app.args[1])
     match_symbol(app.symbol, "Lbl'Stop'SparseBytes")
-    return ()
+
+
+def kore_registers(regs: Pattern) -> dict[int, int]:
+    """Return the value of each initialized register, given either as a ``Map`` or as a ``List`` indexed by register."""
+    res: dict[int, int]
+    if match_app(regs).symbol in _LIST_SYMBOLS:
+        res = {reg: kore_int(val) for reg, val in enumerate(match_list(regs)) if not _is_uninit(val)}
+    else:
+        res = {kore_int(reg): kore_int(val) for reg, val in match_map(regs)}
+    if 0 not in res:
+        res[0] = 0
+    return res
+
+
+def _is_uninit(pattern: Pattern) -> bool:
+    return isinstance(pattern, App) and pattern.symbol == "Lbl'Hash'uninit"
 
 
 def kore_sb_empty(empty: Pattern) -> int:
@@ -60,44 +109,84 @@ def kore_sb_bytes(bs: Pattern) -> bytes:
 
 
 def kore_sparse_bytes(sb: Pattern) -> dict[int, bytes]:
-    sparse_items: list[int | bytes] = []
-    is_bytes = True
-    for sb_item in reversed(match_sparse_bytes(sb)):
-        if is_bytes:
-            sparse_items.append(kore_sb_bytes(sb_item))
-        else:
-            sparse_items.append(kore_sb_empty(sb_item))
-        is_bytes = not is_bytes
-
-    sparse_dict = {}
+    res: dict[int, bytes] = {}
     addr = 0
-    for gap_or_val in reversed(sparse_items):
-        if isinstance(gap_or_val, int):
-            addr += gap_or_val
-        elif isinstance(gap_or_val, bytes):
-            sparse_dict[addr] = gap_or_val
-            addr += len(gap_or_val)
+    for sb_item in match_sparse_bytes(sb):
+        if match_app(sb_item).symbol == "LblSparseBytes'ColnHash'empty":
+            addr += kore_sb_empty(sb_item)
         else:
-            raise AssertionError()
-    return sparse_dict
+            data = kore_sb_bytes(sb_item)
+            res[addr] = data
+            addr += len(data)
+    return res
+
+
+def kore_memory(mem: Pattern) -> dict[int, bytes]:
+    """Return the initialized memory, given either as ``SparseBytes`` or as a ``Map`` from page addresses to pages."""
+    if match_app(mem).symbol not in _MAP_SYMBOLS:
+        return kore_sparse_bytes(mem)
+    res: dict[int, bytes] = {}
+    for page_addr, page in match_map(mem):
+        base = kore_int(page_addr)
+        res.update((base + addr, data) for addr, data in kore_sparse_bytes(page).items())
+    return normalize_memory(res)
 
 
 def normalize_memory(memory: Mapping[int, bytes]) -> dict[int, bytes]:
-    # normalize sparse bytes data by merging contiguous segments
-    raw_memory = sorted(memory.items())
+    """Merge contiguous segments of a ``{address: bytes}`` dictionary.
+
+    Each run of contiguous segments is joined once, and segments which are not contiguous with any other are kept as is.
+    """
     merged_memory: dict[int, bytes] = {}
-    seg_idx = 0
-    while seg_idx < len(raw_memory):
-        start, val = raw_memory[seg_idx]
-        seg_idx += 1
-        while seg_idx < len(raw_memory):
-            start_next, val_next = raw_memory[seg_idx]
-            end_curr = start + len(val)
-            assert end_curr <= start_next
-            if end_curr == start_next:
-                val += val_next
-                seg_idx += 1
-            else:
-                break
-        merged_memory[start] = val
+    run: list[bytes] = []
+    start = end = 0
+    for addr, val in sorted(memory.items()):
+        assert not run or end <= addr
+        if run and end == addr:
+            run.append(val)
+        else:
+            if run:
+                merged_memory[start] = run[0] if len(run) == 1 else b''.join(run)
+            run = [val]
+            start = addr
+        end = addr + len(val)
+    if run:
+        merged_memory[start] = run[0] if len(run) == 1 else b''.join(run)
     return merged_memory
+
+
+def patch_memory(memory: Mapping[int, bytes], patches: Iterable[tuple[int, bytes]]) -> dict[int, bytes]:
+    """Write each ``(address, bytes)`` patch to a ``{address: bytes}`` dictionary, and return the normalized result.
+
+    Patches may overlap the segments, the gaps between them, and each other, in which case later patches take
+    precedence. Each segment of the result that is affected by a patch is built in a single buffer, and all other
+    segments are kept as is.
+    """
+    # (start, end, order, data), where segments of memory are ordered before all patches
+    spans = [(addr, addr + len(val), -1, val) for addr, val in normalize_memory(memory).items()]
+    spans += [(addr, addr + len(val), order, val) for order, (addr, val) in enumerate(patches) if val]
+    spans.sort(key=lambda span: (span[0], span[2]))
+
+    res: dict[int, bytes] = {}
+
+    def flush(group: list[tuple[int, int, int, bytes]], end: int) -> None:
+        start, _, order, val = group[0]
+        if len(group) == 1 and order == -1:
+            res[start] = val
+            return
+        buf = bytearray(end - start)
+        for span_start, span_end, _, span_val in sorted(group, key=lambda span: span[2]):
+            buf[span_start - start : span_end - start] = span_val
+        res[start] = bytes(buf)
+
+    group: list[tuple[int, int, int, bytes]] = []
+    group_end = 0
+    for span in spans:
+        if group and span[0] > group_end:
+            flush(group, group_end)
+            group = []
+        group_end = max(group_end, span[1]) if group else span[1]
+        group.append(span)
+    if group:
+        flush(group, group_end)
+    return res
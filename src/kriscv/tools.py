@@ -1,48 +1,99 @@
 from __future__ import annotations
 
+import logging
+from functools import cached_property
 from pathlib import Path
 from subprocess import CalledProcessError
+from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING
 
-from pyk.kast.inner import KSort, KVariable, Subst
+from pyk.kast.inner import KVariable, Subst
 from pyk.kast.manip import split_config_from
+from pyk.kast.prelude.collections import map_empty
 from pyk.kast.prelude.k import GENERATED_TOP_CELL
-from pyk.kore.match import kore_int
+from pyk.kast.prelude.kint import intToken
+from pyk.konvert import munge
+from pyk.kore.manip import free_occs, substitute_vars
+from pyk.kore.parser import KoreParser
+from pyk.kore.prelude import STOP_MAP, int_dv
 from pyk.ktool.krun import KRun
+from pyk.utils import run_process_2
 
-from kriscv import term_builder
+from kriscv import kore_builder, memory, term_builder
+from kriscv.profile import phase
+from kriscv.state import State
 from kriscv.term_builder import word
-from kriscv.term_manip import kore_sparse_bytes, match_map
+from kriscv.term_manip import kore_memory, kore_registers, patch_memory
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
+    from typing import Final
 
     from pyk.kast import KInner
+    from pyk.kllvm.runtime import Runtime
+    from pyk.kore.syntax import EVar, Pattern
     from pyk.ktool.kprint import KPrint
 
     from .elf_parser import ELF
+    from .memory import Segment
+    from .profile import Profile
+    from .snapshot import Snapshot
+
+_LOGGER: Final = logging.getLogger(__name__)
 
 
 class Tools:
     __krun: KRun
+    __runtime: Runtime | None
+    __binary_kore: bool
+    __temp_dir: Path | None
 
-    def __init__(self, definition_dir: Path, *, temp_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        definition_dir: Path,
+        *,
+        runtime: Runtime | None = None,
+        binary_kore: bool = False,
+        temp_dir: Path | None = None,
+    ) -> None:
         self.__krun = KRun(definition_dir, use_directory=temp_dir)
+        self.__runtime = runtime
+        self.__binary_kore = binary_kore
+        self.__temp_dir = temp_dir
 
     @property
     def krun(self) -> KRun:
         return self.__krun
 
+    @property
+    def runtime(self) -> Runtime | None:
+        return self.__runtime
+
+    @property
+    def binary_kore(self) -> bool:
+        return self.__binary_kore
+
     @property
     def kprint(self) -> KPrint:
         return self.__krun
 
-    def config(self, *, regs: KInner, mem: KInner, pc: KInner, halt: KInner) -> KInner:
+    def config(
+        self,
+        *,
+        regs: KInner,
+        mem: KInner,
+        pc: KInner,
+        halt: KInner,
+        icache: KInner | None = None,
+        instret: KInner | None = None,
+    ) -> KInner:
         config_vars = {
             '$REGS': regs,
             '$MEM': mem,
             '$PC': pc,
             '$HALT': halt,
+            '$ICACHE': icache if icache is not None else map_empty(),
+            '$INSTRET': instret if instret is not None else intToken(0),
         }
         config = self.krun.definition.init_config(sort=GENERATED_TOP_CELL)
         return Subst(config_vars)(config)
@@ -53,8 +104,25 @@ class Tools:
         *,
         regs: dict[int, int] | None = None,
         end_symbol: str | None = None,
+        halt_symbols: Iterable[str] = (),
+        max_instrs: int | None = None,
+        halt_on_env_call: bool = False,
         symbolic_names: Iterable[str] | None = None,
+        predecode: bool = True,
+        patches: Iterable[tuple[int, bytes]] = (),
     ) -> KInner:
+        """Build the initial configuration for executing ``elf``.
+
+        Execution halts when the ``PC`` reaches ``end_symbol`` or any of ``halt_symbols``, once ``max_instrs``
+        instructions have been retired, or, if ``halt_on_env_call`` is set, on an ``ECALL`` or ``EBREAK`` instruction.
+
+        Unless ``predecode`` is disabled, the instruction cache is populated with the disassembled contents of the
+        executable segments of ``elf``. As the instruction cache is only used on concrete execution, it is always
+        left empty if ``symbolic_names`` are given.
+
+        Each ``(address, bytes)`` pair in ``patches`` is written to the memory of ``elf`` before execution, with later
+        patches overwriting earlier ones. Patches are also reflected in the instruction cache.
+        """
         from pyk.kast.prelude.ml import mlAnd
 
         from .elf_parser import ELF
@@ -71,43 +139,251 @@ class Tools:
                 res[symbol.addr] = SymBytes(var, symbol.size)
             return res
 
+        memory = patch_memory(elf.memory, patches)
         symdata = _symdata(symbolic_names) if symbolic_names else {}
-        mem, cnstrs = SparseBytes.from_data(data=elf.memory, symdata=symdata).to_k()
+        mem, cnstrs = SparseBytes.from_data(data=memory, symdata=symdata).to_k()
 
         _regs = term_builder.regs(regs or {})
         pc = word(elf.entry_point)
 
-        halt: KInner
-        if end_symbol is not None:
-            end_addr = elf.unique_symbol(end_symbol).addr
-            halt = term_builder.halt_at_address(term_builder.word(end_addr))
-        else:
-            halt = term_builder.halt_never()
+        halt = term_builder.halt(
+            _halt_addresses(elf, end_symbol, halt_symbols), max_instrs=max_instrs, env_call=halt_on_env_call
+        )
+
+        icache = term_builder.icache(elf.instructions(memory)) if predecode and not symdata else None
 
-        config = self.config(regs=_regs, mem=mem, pc=pc, halt=halt)
+        config = self.config(regs=_regs, mem=mem, pc=pc, halt=halt, icache=icache)
         config = mlAnd([config] + cnstrs)
         return config
 
+    @cached_property
+    def _kore_template(self) -> tuple[Pattern, dict[str, EVar]]:
+        config = self.krun.definition.init_config(sort=GENERATED_TOP_CELL)
+        template = self.krun.kast_to_kore(config, sort=GENERATED_TOP_CELL)
+        config_vars = {name: occs[0] for name, occs in free_occs(template).items()}
+        return template, config_vars
+
+    def kore_config(
+        self,
+        *,
+        regs: Pattern,
+        mem: Pattern,
+        pc: Pattern,
+        halt: Pattern,
+        icache: Pattern | None = None,
+        instret: Pattern | None = None,
+    ) -> Pattern:
+        """Same as ``config``, but substituting Kore patterns into a cached Kore template of the initial configuration."""
+        config_vars = {
+            '$REGS': regs,
+            '$MEM': mem,
+            '$PC': pc,
+            '$HALT': halt,
+            '$ICACHE': icache if icache is not None else STOP_MAP,
+            '$INSTRET': instret if instret is not None else int_dv(0),
+        }
+        template, template_vars = self._kore_template
+        subst = {template_vars['Var' + munge(name)]: value for name, value in config_vars.items()}
+        return substitute_vars(template, subst)
+
+    def kore_config_from_elf(
+        self,
+        elf: str | Path | ELF,
+        *,
+        regs: dict[int, int] | None = None,
+        end_symbol: str | None = None,
+        halt_symbols: Iterable[str] = (),
+        max_instrs: int | None = None,
+        halt_on_env_call: bool = False,
+        predecode: bool = True,
+        patches: Iterable[tuple[int, bytes]] = (),
+    ) -> Pattern:
+        """Same as ``config_from_elf``, but building the concrete initial configuration directly in Kore."""
+        from .elf_parser import ELF
+        from .sparse_bytes import SparseBytes
+
+        if not isinstance(elf, ELF):
+            elf = ELF.load(elf)
+
+        memory = patch_memory(elf.memory, patches)
+        mem = SparseBytes.from_concrete(memory).to_kore()
+        _regs = kore_builder.regs(regs or {})
+        pc = kore_builder.word(elf.entry_point)
+
+        halt = kore_builder.halt(
+            _halt_addresses(elf, end_symbol, halt_symbols), max_instrs=max_instrs, env_call=halt_on_env_call
+        )
+
+        icache = kore_builder.icache(elf.instructions(memory)) if predecode else None
+
+        return self.kore_config(regs=_regs, mem=mem, pc=pc, halt=halt, icache=icache)
+
+    def kore_config_from_snapshot(self, snapshot: Snapshot) -> Pattern:
+        from .sparse_bytes import SparseBytes
+
+        return self.kore_config(
+            regs=kore_builder.regs(snapshot.regs),
+            mem=SparseBytes.from_concrete(snapshot.memory).to_kore(),
+            pc=kore_builder.word(snapshot.pc),
+            halt=snapshot.halt,
+            instret=int_dv(snapshot.instret),
+        )
+
+    def run(self, config: Pattern, *, depth: int | None = None, profile: Profile | None = None) -> State:
+        return State(self.run_pattern(config, depth=depth, profile=profile), kprint=self.kprint)
+
+    def run_checkpointed(
+        self,
+        config: Pattern,
+        *,
+        checkpoint_dir: Path,
+        checkpoint_depth: int,
+        depth: int | None = None,
+        start_depth: int = 0,
+        profile: Profile | None = None,
+    ) -> State:
+        """Run in slices of ``checkpoint_depth`` steps, writing a ``Snapshot`` to ``checkpoint_dir`` after each slice.
+
+        After each slice, execution is first advanced to the next instruction boundary, so slices may run slightly
+        longer than ``checkpoint_depth`` steps. Snapshots are named after the total depth at which they were taken,
+        counted from ``start_depth``. If a ``profile`` is given, the number of memory segments is sampled after each slice.
+        """
+        from .snapshot import Snapshot
+
+        if checkpoint_depth <= 0:
+            raise ValueError(f'Expected a positive checkpoint depth, got: {checkpoint_depth}')
+
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        state = State(config, kprint=self.kprint)
+        total_depth = start_depth
+        end_depth = start_depth + depth if depth is not None else None
+
+        while not state.halted and (end_depth is None or total_depth < end_depth):
+            slice_depth = checkpoint_depth if end_depth is None else min(checkpoint_depth, end_depth - total_depth)
+            next_state = self.run(state.pattern, depth=slice_depth, profile=profile)
+            total_depth += slice_depth
+            while not next_state.at_boundary and not next_state.halted:
+                prev_pattern = next_state.pattern
+                next_state = self.run(prev_pattern, depth=1, profile=profile)
+                total_depth += 1
+                if next_state.pattern == prev_pattern:
+                    break
+            if next_state.pattern == state.pattern:
+                # Stuck
+                break
+            state = next_state
+            if profile is not None:
+                profile.sample('segments', len(state.segments()))
+            if state.at_boundary:
+                Snapshot.from_state(state, depth=total_depth).write(checkpoint_dir / f'{total_depth:012}.json')
+
+        return state
+
     def run_config(self, config: KInner, *, depth: int | None = None) -> KInner:
         config_kore = self.krun.kast_to_kore(config, sort=GENERATED_TOP_CELL)
+        final_config_kore = self.run_pattern(config_kore, depth=depth)
+        return self.krun.kore_to_kast(final_config_kore)
+
+    def run_pattern(self, pattern: Pattern, *, depth: int | None = None, profile: Profile | None = None) -> Pattern:
+        """Rewrite ``pattern`` for at most ``depth`` steps.
+
+        If a ``profile`` is given, the time spent serializing, interpreting and parsing is recorded in it, along with
+        the size of the input and output, and the number of rewrite steps taken.
+        """
+        if self.__runtime is not None:
+            return self._run_in_process(self.__runtime, pattern, depth=depth, profile=profile)
+        if self.__binary_kore or profile is not None:
+            return self._run_interpreter(pattern, depth=depth, binary=self.__binary_kore, profile=profile)
+        return self._run_krun(pattern, depth=depth)
+
+    @staticmethod
+    def _run_in_process(runtime: Runtime, pattern: Pattern, *, depth: int | None, profile: Profile | None) -> Pattern:
+        from pyk.kllvm.convert import llvm_to_pattern, pattern_to_llvm
+
+        with phase(profile, 'serialize_input'):
+            llvm_pattern = pattern_to_llvm(pattern)
+        with phase(profile, 'interpret'):
+            llvm_result = runtime.step(llvm_pattern, depth=depth)
+        with phase(profile, 'parse_output'):
+            return llvm_to_pattern(llvm_result)
+
+    def _run_krun(self, pattern: Pattern, *, depth: int | None) -> Pattern:
         try:
-            final_config_kore = self.krun.run_pattern(config_kore, depth=depth, check=True)
+            return self.krun.run_pattern(pattern, depth=depth, check=True)
         except CalledProcessError as e:
-            path = Path.cwd()
-            stdout_path = path / 'krun_stdout.txt'
-            stderr_path = path / 'krun_stderr.txt'
-            input_path = path / 'krun_input.txt'
-
-            stdout_path.write_text(e.stdout)
-            stderr_path.write_text(e.stderr)
-            input_path.write_text(config_kore.text)
-
-            print('Generated debug files:')
-            print(f'- {stdout_path.resolve()}: KRun standard output')
-            print(f'- {stderr_path.resolve()}: KRun error output')
-            print(f'- {input_path.resolve()}: Input configuration in Kore format')
+            self._write_debug_files(e, 'krun_input.txt', pattern.text)
             raise
-        return self.krun.kore_to_kast(final_config_kore)
+
+    def _run_interpreter(
+        self,
+        pattern: Pattern,
+        *,
+        depth: int | None,
+        binary: bool,
+        profile: Profile | None,
+    ) -> Pattern:
+        """Run the interpreter directly, passing the configuration back and forth in either Kore text or binary Kore.
+
+        Unlike Kore text, the binary format stores ``Bytes`` literals unescaped, which makes both serialization and
+        parsing considerably cheaper for configurations with large memory images.
+        """
+        from pyk.kllvm.ast import Pattern as LLVMPattern
+        from pyk.kllvm.convert import llvm_to_pattern, pattern_to_llvm
+
+        interpreter = self.krun.definition_dir / 'interpreter'
+        with phase(profile, 'serialize_input'):
+            input_data = pattern_to_llvm(pattern).serialize() if binary else pattern.text.encode()
+
+        with TemporaryDirectory(dir=self.__temp_dir) as temp_dir:
+            input_file = Path(temp_dir) / 'input.kore'
+            output_file = Path(temp_dir) / 'output.kore'
+            input_file.write_bytes(input_data)
+            args = [str(interpreter), str(input_file), str(depth if depth is not None else -1), str(output_file)]
+            if binary:
+                args.append('--binary-output')
+            if profile is not None:
+                args.append('--statistics')
+            with phase(profile, 'interpret'):
+                try:
+                    run_process_2(args, logger=_LOGGER, check=True)
+                except CalledProcessError as e:
+                    if binary:
+                        self._write_debug_files(e, 'krun_input.bin', input_data)
+                    else:
+                        self._write_debug_files(e, 'krun_input.txt', input_data.decode())
+                    raise
+            output_data = output_file.read_bytes()
+
+        steps, output_data = _split_statistics(output_data)
+        if profile is not None:
+            profile.count('input_size', len(input_data))
+            profile.count('output_size', len(output_data))
+            if steps is not None:
+                profile.count('steps', steps)
+
+        with phase(profile, 'parse_output'):
+            if binary:
+                return llvm_to_pattern(LLVMPattern.deserialize(output_data))
+            return KoreParser(output_data.decode()).pattern()
+
+    @staticmethod
+    def _write_debug_files(e: CalledProcessError, input_name: str, input_data: str | bytes) -> None:
+        path = Path.cwd()
+        stdout_path = path / 'krun_stdout.txt'
+        stderr_path = path / 'krun_stderr.txt'
+        input_path = path / input_name
+
+        stdout_path.write_text(e.stdout)
+        stderr_path.write_text(e.stderr)
+        if isinstance(input_data, bytes):
+            input_path.write_bytes(input_data)
+        else:
+            input_path.write_text(input_data)
+
+        print('Generated debug files:')
+        print(f'- {stdout_path.resolve()}: KRun standard output')
+        print(f'- {stderr_path.resolve()}: KRun error output')
+        print(f'- {input_path.resolve()}: Input configuration in Kore format')
 
     def pretty(self, config: KInner) -> str:
         from . import utils
@@ -116,19 +392,36 @@ class Tools:
 
     def get_registers(self, config: KInner) -> dict[int, int]:
         _, cells = split_config_from(config)
-        regs_kore = self.krun.kast_to_kore(cells['REGS_CELL'], sort=KSort('Map'))
-        regs = {}
-        for reg, val in match_map(regs_kore):
-            regs[kore_int(reg)] = kore_int(val)
-        if 0 not in regs:
-            regs[0] = 0
-        return regs
+        regs = cells['REGS_CELL']
+        regs_kore = self.krun.kast_to_kore(regs, sort=self.krun.definition.sort_strict(regs))
+        return kore_registers(regs_kore)
+
+    def get_segments(self, config: KInner) -> list[Segment]:
+        return memory.segments(self._get_memory(config))
 
     def get_memory(self, config: KInner) -> dict[int, int]:
-        _, cells = split_config_from(config)
-        mem_kore = self.krun.kast_to_kore(cells['MEM_CELL'], sort=KSort('SparseBytes'))
         mem = {}
-        for addr, data in kore_sparse_bytes(mem_kore).items():
+        for addr, data in self._get_memory(config).items():
             for idx, val in enumerate(data):
                 mem[addr + idx] = val
         return mem
+
+    def _get_memory(self, config: KInner) -> dict[int, bytes]:
+        _, cells = split_config_from(config)
+        mem = cells['MEM_CELL']
+        mem_kore = self.krun.kast_to_kore(mem, sort=self.krun.definition.sort_strict(mem))
+        return kore_memory(mem_kore)
+
+
+def _halt_addresses(elf: ELF, end_symbol: str | None, halt_symbols: Iterable[str]) -> list[int]:
+    names = [end_symbol, *halt_symbols] if end_symbol is not None else list(halt_symbols)
+    return [elf.unique_symbol(name).addr for name in names]
+
+
+def _split_statistics(output: bytes) -> tuple[int | None, bytes]:
+    """Split the ``[ steps: N ]`` line printed by the interpreter on ``--statistics`` from the output configuration."""
+    prefix = b'[ steps: '
+    if not output.startswith(prefix):
+        return None, output
+    line, _, rest = output.partition(b'\n')
+    return int(line[len(prefix) :].rstrip(b' ]')), rest
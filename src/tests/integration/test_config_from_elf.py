@@ -49,7 +49,211 @@ def test_concrete_config_from_elf(tools: Tools) -> None:
     assert tools.get_registers(config) == {0: 0, 1: 1, 2: 2, 3: 3}
 
 
-def test_symbolic_config_from_elf(tools: Tools, symtools: SymTools, tmp_path: Path) -> None:
+def test_kore_config_from_elf(tools: Tools) -> None:
+    # Given
+    config = tools.kore_config_from_elf(_ELF, end_symbol='END')
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.registers() == {0: 0, 1: 1, 2: 2, 3: 3}
+    assert state.pc == 20
+    assert state.halted
+
+
+def test_kore_config_from_elf_max_instrs(tools: Tools) -> None:
+    # Given
+    config = tools.kore_config_from_elf(_ELF, end_symbol='END', max_instrs=2)
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.halted
+    assert state.instret == 2
+    assert state.registers() == {0: 0, 1: 1, 2: 2}
+
+
+def test_kore_config_from_elf_halt_symbols(tools: Tools) -> None:
+    # Given
+    elf = ELF(
+        entry_point=_ELF.entry_point,
+        memory=_ELF.memory,
+        symbols={**_ELF.symbols, 'MID': [Symbol(16, 0)]},
+    )
+    config = tools.kore_config_from_elf(elf, end_symbol='END', halt_symbols=['MID'])
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.halted
+    assert state.pc == 16
+
+
+def test_kore_config_from_elf_halt_on_env_call(tools: Tools) -> None:
+    # Given
+    elf = ELF(
+        entry_point=8,
+        memory={8: b'\x93\x00\x10\x00' b'\x73\x00\x00\x00'},  # addi x1, x0, 1; ecall
+        symbols={},
+    )
+    config = tools.kore_config_from_elf(elf, halt_on_env_call=True)
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.halted
+    assert state.pc == 12
+    assert state.registers() == {0: 0, 1: 1}
+
+
+def test_run_checkpointed(tools: Tools, tmp_path: Path) -> None:
+    from kriscv.snapshot import Snapshot
+
+    # Given
+    config = tools.kore_config_from_elf(_ELF, end_symbol='END')
+
+    # When
+    state = tools.run_checkpointed(config, checkpoint_dir=tmp_path, checkpoint_depth=3)
+
+    # Then
+    assert state.halted
+    assert state.registers() == {0: 0, 1: 1, 2: 2, 3: 3}
+
+    # And given
+    snapshot_files = sorted(tmp_path.glob('*.json'))
+    assert snapshot_files
+    snapshot = Snapshot.read(snapshot_files[0])
+
+    # When
+    resumed_state = tools.run(tools.kore_config_from_snapshot(snapshot))
+
+    # Then
+    assert resumed_state.halted
+    assert resumed_state.registers() == {0: 0, 1: 1, 2: 2, 3: 3}
+
+
+def test_concrete_config_from_elf_in_process(temp_dir: Path) -> None:
+    from kriscv import build
+
+    # Given
+    tools = build.semantics(temp_dir=temp_dir, in_process=True)
+    config = tools.config_from_elf(_ELF, end_symbol='END')
+
+    # When
+    config = tools.run_config(config)
+
+    # Then
+    assert tools.get_registers(config) == {0: 0, 1: 1, 2: 2, 3: 3}
+
+
+def test_kore_config_from_elf_predecode(tools: Tools) -> None:
+    # Given
+    elf = ELF(entry_point=_ELF.entry_point, memory=_ELF.memory, symbols=_ELF.symbols, code=[0])
+    config = tools.kore_config_from_elf(elf, end_symbol='END')
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.registers() == {0: 0, 1: 1, 2: 2, 3: 3}
+    assert state.pc == 20
+
+
+def test_kore_config_from_elf_fused(temp_dir: Path) -> None:
+    from kriscv import build
+
+    # Given
+    tools = build.semantics(temp_dir=temp_dir, fused=True)
+    elf = ELF(entry_point=_ELF.entry_point, memory=_ELF.memory, symbols=_ELF.symbols, code=[0])
+    config = tools.kore_config_from_elf(elf, end_symbol='END')
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.registers() == {0: 0, 1: 1, 2: 2, 3: 3}
+    assert state.halted
+    assert state.instret == 3
+
+
+def test_kore_config_from_elf_blocks(temp_dir: Path) -> None:
+    from kriscv import build
+
+    # Given
+    tools = build.semantics(temp_dir=temp_dir, blocks=True)
+    elf = ELF(entry_point=_ELF.entry_point, memory=_ELF.memory, symbols=_ELF.symbols, code=[0])
+    config = tools.kore_config_from_elf(elf, end_symbol='END')
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.registers() == {0: 0, 1: 1, 2: 2, 3: 3}
+    assert state.halted
+    assert state.pc == 20
+    assert state.instret == 3
+
+
+def test_kore_config_from_elf_blocks_max_instrs(temp_dir: Path) -> None:
+    from kriscv import build
+
+    # Given
+    tools = build.semantics(temp_dir=temp_dir, blocks=True)
+    elf = ELF(entry_point=_ELF.entry_point, memory=_ELF.memory, symbols=_ELF.symbols, code=[0])
+    config = tools.kore_config_from_elf(elf, end_symbol='END', max_instrs=2)
+
+    # When
+    state = tools.run(config)
+
+    # Then
+    assert state.halted
+    assert state.instret == 2
+    assert state.registers() == {0: 0, 1: 1, 2: 2}
+
+
+def test_specialized_module(tools: Tools) -> None:
+    from kriscv.specialize import specialized_module
+
+    # Given
+    elf = ELF(
+        entry_point=0,
+        memory={0: b'\xef\x00\x80\x00' b'\x17\x11\x00\x00'},  # jal x1, 8; auipc x2, 1
+        symbols={},
+        code=[0],
+    )
+
+    # When
+    module = specialized_module(tools, elf)
+
+    # Then
+    assert module.startswith('requires "riscv-semantics/riscv-specialize.md"')
+    assert '<pc> 0 </pc>' in module
+    assert '#WRITE_REG(1, 4) ~> #RETIRE(8) ~> #CHECK_HALT' in module
+    assert '<pc> 4 </pc>' in module
+    assert '#WRITE_REG(2, 4100) ~> #RETIRE(8) ~> #CHECK_HALT' in module
+
+
+def test_concrete_config_from_elf_binary_kore(tools: Tools, temp_dir: Path) -> None:
+    from kriscv import build
+
+    # Given
+    binary_tools = build.semantics(temp_dir=temp_dir, binary_kore=True)
+    config = tools.kore_config_from_elf(_ELF, end_symbol='END')
+
+    # When
+    expected = tools.run(config)
+    actual = binary_tools.run(config)
+
+    # Then
+    assert actual.registers() == {0: 0, 1: 1, 2: 2, 3: 3}
+    assert actual.pattern == expected.pattern
+
+
+def test_symbolic_config_from_elf(symtools: SymTools, tmp_path: Path) -> None:
     from pyk.kast.inner import KApply, KLabel, KSequence, KSort, KVariable, Subst
     from pyk.kast.outer import KFlatModule, KImport
     from pyk.kast.prelude.collections import map_of
@@ -65,6 +269,7 @@ def test_symbolic_config_from_elf(tools: Tools, symtools: SymTools, tmp_path: Pa
     # Given
     spec_file = tmp_path / 'test-spec.k'
 
+    tools = symtools.tools
     init_config = tools.config_from_elf(_ELF, end_symbol='END', symbolic_names=['OP1', 'OP2'])
     empty_config = tools.krun.definition.empty_config(KSort('GeneratedTopCell'))
     regs: dict[KInner, KInner] = {
@@ -9,7 +9,10 @@ from pyk.kore.prelude import INT, SORT_K_ITEM, generated_counter, generated_top,
 from pyk.kore.syntax import App, SortApp
 from pyk.ktool.krun import llvm_interpret
 
+import kriscv.kore_builder as kb
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from pathlib import Path
     from typing import Final
 
@@ -167,6 +170,76 @@ def test_mulhsu(definition_dir: Path, op1: int, op2: int) -> None:
     )
 
 
+@pytest.mark.parametrize('op1,op2', MUL_TEST_DATA, ids=count())
+def test_add(definition_dir: Path, op1: int, op2: int) -> None:
+    _test_binary_op(
+        definition_dir=definition_dir,
+        symbol='LbladdWord',
+        op1=op1,
+        op2=op2,
+        res=chop(op1 + op2),
+    )
+
+
+@pytest.mark.parametrize('op1,op2', MUL_TEST_DATA, ids=count())
+def test_sub(definition_dir: Path, op1: int, op2: int) -> None:
+    _test_binary_op(
+        definition_dir=definition_dir,
+        symbol='LblsubWord',
+        op1=op1,
+        op2=op2,
+        res=chop(op1 - op2),
+    )
+
+
+SHIFT_TEST_DATA: Final = (
+    (0, 0),
+    (1, 0),
+    (1, 31),
+    (0xFFFFFFFF, 1),
+    (0x80000000, 31),
+    (0x7FFFFFFF, 4),
+    (0x80000001, 32),
+    (0xFFFF8765, 40),
+)
+
+
+assert all(is_32bit(op1) and op2 >= 0 for op1, op2 in SHIFT_TEST_DATA)
+
+
+@pytest.mark.parametrize('op1,op2', SHIFT_TEST_DATA, ids=count())
+def test_sll(definition_dir: Path, op1: int, op2: int) -> None:
+    _test_binary_op(
+        definition_dir=definition_dir,
+        symbol='LbllshWord',
+        op1=op1,
+        op2=op2,
+        res=chop(op1 << op2),
+    )
+
+
+@pytest.mark.parametrize('op1,op2', SHIFT_TEST_DATA, ids=count())
+def test_srl(definition_dir: Path, op1: int, op2: int) -> None:
+    _test_binary_op(
+        definition_dir=definition_dir,
+        symbol='LblrshWord',
+        op1=op1,
+        op2=op2,
+        res=op1 >> op2,
+    )
+
+
+@pytest.mark.parametrize('op1,op2', SHIFT_TEST_DATA, ids=count())
+def test_sra(definition_dir: Path, op1: int, op2: int) -> None:
+    _test_binary_op(
+        definition_dir=definition_dir,
+        symbol='LblashWord',
+        op1=op1,
+        op2=op2,
+        res=chop(signed(op1) >> op2),
+    )
+
+
 DIV_TEST_DATA: Final = (
     # Normal division cases
     (10, 3),
@@ -285,3 +358,69 @@ def test_remu(definition_dir: Path, op1: int, op2: int) -> None:
         op2=op2,
         res=remu_expected(op1, op2),
     )
+
+
+SPARSE_BYTES: Final[tuple[int | bytes, ...]] = (b'\x01\x02\x03\x04\x05\x06\x07\x08', 4, b'\x09\x0a')
+
+
+def _flat(items: Iterable[int | bytes]) -> bytes:
+    return b''.join(bytes(item) if isinstance(item, int) else item for item in items)
+
+
+def _eval(definition_dir: Path, app: Pattern) -> Pattern:
+    from pyk.kore.match import match_app
+
+    actual = llvm_interpret(definition_dir, config(app))
+    k_cell = match_app(actual, "Lbl'-LT-'generatedTop'-GT-'").args[0]
+    return match_app(match_app(k_cell, "Lbl'-LT-'k'-GT-'").args[0], 'kseq').args[0]
+
+
+# index, number of bytes
+READ_BYTES_TEST_DATA: Final = (
+    (0, 4),
+    (4, 4),
+    (2, 2),
+    (7, 1),
+    (6, 4),
+    (9, 2),
+    (11, 2),
+    (12, 2),
+    (14, 4),
+)
+
+
+@pytest.mark.parametrize('index,num_bytes', READ_BYTES_TEST_DATA, ids=count())
+def test_bench_read_bytes(definition_dir: Path, index: int, num_bytes: int) -> None:
+    # Given
+    app = App('LblbenchReadBytes', (), (int_dv(1), int_dv(index), int_dv(num_bytes), kb.sparse_bytes(SPARSE_BYTES)))
+    expected = int.from_bytes(_flat(SPARSE_BYTES)[index : index + num_bytes].ljust(num_bytes, b'\x00'), 'little')
+
+    # When
+    actual = _eval(definition_dir, inj(SortApp('SortInt'), SORT_K_ITEM, app))
+
+    # Then
+    assert actual == inj(SortApp('SortInt'), SORT_K_ITEM, int_dv(expected))
+
+
+# index, number of bytes, expected memory
+WRITE_BYTES_TEST_DATA: Final = (
+    (0, 4, {0: b'\x00\x00\x00\x00\x05\x06\x07\x08', 12: b'\x09\x0a'}),
+    (6, 2, {0: b'\x01\x02\x03\x04\x05\x06\x00\x00', 12: b'\x09\x0a'}),
+    (7, 2, {0: b'\x01\x02\x03\x04\x05\x06\x07\x00\x00', 12: b'\x09\x0a'}),
+    (9, 1, {0: b'\x01\x02\x03\x04\x05\x06\x07\x08\x00\x00', 12: b'\x09\x0a'}),
+    (12, 1, {0: b'\x01\x02\x03\x04\x05\x06\x07\x08', 12: b'\x00\x0a'}),
+)
+
+
+@pytest.mark.parametrize('index,num_bytes,expected', WRITE_BYTES_TEST_DATA, ids=count())
+def test_bench_write_bytes(definition_dir: Path, index: int, num_bytes: int, expected: dict[int, bytes]) -> None:
+    from kriscv.term_manip import kore_sparse_bytes, strip_inj
+
+    # Given
+    app = App('LblbenchWriteBytes', (), (int_dv(1), int_dv(index), int_dv(num_bytes), kb.sparse_bytes(SPARSE_BYTES)))
+
+    # When
+    actual = _eval(definition_dir, inj(kb.SORT_SPARSE_BYTES, SORT_K_ITEM, app))
+
+    # Then
+    assert kore_sparse_bytes(strip_inj(actual)) == expected
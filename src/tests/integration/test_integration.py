@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 import pytest
 import yaml
 
+from kriscv import memory
 from kriscv.build import semantics
 from kriscv.elf_parser import ELF
 
@@ -15,6 +16,7 @@ from ..utils import TESTS_DIR
 if TYPE_CHECKING:
     from typing import Final
 
+    from kriscv.memory import Segment
     from kriscv.tools import Tools
 
 SIMPLE_DIR: Final = TESTS_DIR / 'simple'
@@ -48,7 +50,7 @@ def _check_regs_entry(assert_file: Path, registers: dict[int, int], reg: int, va
         raise AssertionError(err_msg + f'found {actual} (0x{actual:08X}).')
 
 
-def _check_mem_entry(assert_file: Path, mem_symbol: int, memory: dict[int, int], offset: int, val: int) -> None:
+def _check_mem_entry(assert_file: Path, mem_symbol: int, segments: list[Segment], offset: int, val: int) -> None:
     addr = mem_symbol + offset
     mem_str = f'{mem_symbol} (0x{mem_symbol:08X})'
     offset_str = f'{offset} (0x{offset:08X})'
@@ -68,9 +70,9 @@ def _check_mem_entry(assert_file: Path, mem_symbol: int, memory: dict[int, int],
         + '{reason}'
         + f". Symbol '_mem' is at address {mem_str}, so this offset corresponds to absolute address {addr_str}."
     )
-    if addr not in memory:
+    (actual,) = memory.read(segments, addr, addr + 1)
+    if actual is None:
         raise AssertionError(err_msg.format(reason='this location was never written to'))
-    actual = memory[addr]
     if actual != expect:
         raise AssertionError(err_msg.format(reason=f'found {actual} (0x{actual:02X})'))
 
@@ -85,7 +87,7 @@ def _test_simple(tools: Tools, elf_file: Path, assert_file: Path, final_config_o
         final_config_output.write_text(pretty_config)
 
     registers = tools.get_registers(final_config)
-    memory = tools.get_memory(final_config)
+    segments = tools.get_segments(final_config)
 
     assert_file = assert_file.resolve(strict=True)
     asserts = yaml.safe_load(assert_file.read_bytes())
@@ -113,16 +115,10 @@ def _test_simple(tools: Tools, elf_file: Path, assert_file: Path, final_config_o
             raise AssertionError(f"{assert_file}: Unexpected key {reg} in 'mem'. Expected an integer address.")
         if not isinstance(val, int):
             raise AssertionError(f"{assert_file}: Unexpected value {val} in 'mem'. Expected an 8-bit integer.")
-        _check_mem_entry(assert_file, mem_symbol, memory, addr, val)
+        _check_mem_entry(assert_file, mem_symbol, segments, addr, val)
 
 
-@pytest.mark.parametrize(
-    'asm_file',
-    SIMPLE_TESTS,
-    ids=[str(test.relative_to(SIMPLE_DIR)) for test in SIMPLE_TESTS],
-)
-def test_simple(asm_file: Path, save_final_config: bool, temp_dir: Path) -> None:
-    elf_file = Path(temp_dir) / (asm_file.stem + '.elf')
+def _compile_simple(asm_file: Path, elf_file: Path) -> None:
     # Use rv32em for tests that require M extension (mul/div/rem instructions)
     arch = 'rv32em' if asm_file.stem in ['rem', 'remu'] else 'rv32e'
     compile_cmd = [
@@ -143,6 +139,53 @@ def test_simple(asm_file: Path, save_final_config: bool, temp_dir: Path) -> None
     ]
     subprocess.run(compile_cmd, check=True)
     assert elf_file.exists()
+
+
+@pytest.mark.parametrize(
+    'asm_file',
+    SIMPLE_TESTS,
+    ids=[str(test.relative_to(SIMPLE_DIR)) for test in SIMPLE_TESTS],
+)
+def test_simple(asm_file: Path, save_final_config: bool, temp_dir: Path) -> None:
+    elf_file = Path(temp_dir) / (asm_file.stem + '.elf')
+    _compile_simple(asm_file, elf_file)
     assert_file = Path(str(asm_file) + '.assert')
     final_config_output = (Path(temp_dir) / (asm_file.name + '.out')) if save_final_config else None
     _test_simple(semantics(temp_dir=temp_dir), elf_file, assert_file, final_config_output)
+
+
+SELF_MODIFYING_TESTS: Final = (SIMPLE_DIR / 'self-modifying.S', SIMPLE_DIR / 'self-modifying-from-data.S')
+
+
+@pytest.mark.parametrize(
+    'asm_file',
+    SELF_MODIFYING_TESTS,
+    ids=[str(test.relative_to(SIMPLE_DIR)) for test in SELF_MODIFYING_TESTS],
+)
+def test_simple_blocks(asm_file: Path, temp_dir: Path) -> None:
+    elf_file = Path(temp_dir) / (asm_file.stem + '.elf')
+    _compile_simple(asm_file, elf_file)
+    assert_file = Path(str(asm_file) + '.assert')
+    _test_simple(semantics(temp_dir=temp_dir, blocks=True), elf_file, assert_file, None)
+
+
+def test_specialize(tools: Tools, temp_dir: Path, tmp_path: Path) -> None:
+    from kriscv.specialize import specialize
+    from kriscv.tools import Tools
+
+    # Given
+    elf_file = Path(temp_dir) / 'jal.elf'
+    _compile_simple(SIMPLE_DIR / 'jal.S', elf_file)
+    definition_dir = specialize(elf_file, cache_dir=tmp_path / 'specialized')
+    specialized_tools = Tools(definition_dir, temp_dir=temp_dir)
+
+    # When
+    expected = tools.run(tools.kore_config_from_elf(elf_file, end_symbol='_halt'))
+    actual = specialized_tools.run(specialized_tools.kore_config_from_elf(elf_file, end_symbol='_halt'))
+
+    # Then
+    assert actual.halted
+    assert actual.registers() == expected.registers()
+    assert actual.pc == expected.pc
+    assert actual.instret == expected.instret
+    assert specialize(elf_file, cache_dir=tmp_path / 'specialized') == definition_dir
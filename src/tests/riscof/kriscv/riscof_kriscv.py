@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
 import shutil
+import subprocess
 from importlib.metadata import version
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -53,6 +55,7 @@ class kriscv(pluginTemplate):  # noqa N801
         name = self.name[:-1]  # riscof includes an extra : on the end of the name for some reason
         make = utils.makeUtil(makefilePath=os.path.join(self.workdir, f'Makefile.{name}'))
         make.makeCommand = f'make -j {self.num_jobs}'
+        manifest = []
         for entry in testlist.values():
             test_path = entry['test_path']
             march = entry['isa'].lower()
@@ -74,15 +77,29 @@ class kriscv(pluginTemplate):  # noqa N801
             )
             work_dir = Path(entry['work_dir']).resolve(strict=True)
             sig_file = work_dir / (name + '.signature')
-            execute_cmd = (
-                f'kriscv run-arch-test {test_name}.elf --output {sig_file}' if self.target_run else 'echo "NO RUN"'
-            )
-            execute = f'@cd {work_dir}; {compile_asm_cmd}; {compile_elf_cmd}; {objdump_cmd}; {execute_cmd}'
+            execute = f'@cd {work_dir}; {compile_asm_cmd}; {compile_elf_cmd}; {objdump_cmd}'
             make.add_target(execute, tname=test_name)
+            manifest.append(
+                {
+                    'id': test_name,
+                    'elf': str(work_dir / f'{test_name}.elf'),
+                    'end_symbol': '_halt',
+                    'signature_file': str(sig_file),
+                }
+            )
         make.execute_all(self.workdir)
         if not self.target_run:
             raise SystemExit(0)
 
+        # Run all tests in a single process pool, rather than starting kriscv once per test
+        manifest_file = Path(self.workdir) / f'manifest.{name}.jsonl'
+        manifest_file.write_text(''.join(json.dumps(job) + '\n' for job in manifest))
+        results_file = Path(self.workdir) / f'results.{name}.jsonl'
+        subprocess.run(
+            ['kriscv', 'run-batch', str(manifest_file), '--jobs', self.num_jobs, '--output', str(results_file)],
+            check=True,
+        )
+
 
 def _mabi(spec_isa: str) -> str:
     if '64I' in spec_isa:
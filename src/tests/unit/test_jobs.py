@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from kriscv import memory
+from kriscv.batch import load_jobs
+from kriscv.elf_parser import ELF
+from kriscv.jobs import Job, hex_range, signature
+
+
+def test_job_from_dict() -> None:
+    # Given
+    dct = {'id': 1, 'elf': 'test.elf', 'end_symbol': '_halt', 'regs': {'1': 5}, 'max_instrs': 10, 'memory': [[0, 4]]}
+
+    # When
+    actual = Job.from_dict(dct, base_dir=Path('/tmp'))
+
+    # Then
+    assert actual == Job(
+        elf_file=Path('/tmp/test.elf'),
+        id=1,
+        end_symbol='_halt',
+        regs={1: 5},
+        max_instrs=10,
+        memory=[(0, 4)],
+    )
+    assert Job.from_dict(actual.to_dict()) == actual
+
+
+def test_job_from_dict_missing_elf() -> None:
+    with pytest.raises(ValueError):
+        Job.from_dict({'id': 1})
+
+
+def test_hex_range() -> None:
+    # Given
+    segments = memory.segments({0: b'\x01\xab', 3: b'\x00'})
+
+    # When
+    actual = hex_range(segments, 0, 5)
+
+    # Then
+    assert actual == '01ab--00--'
+
+
+def test_load_jobs_manifest(tmp_path: Path) -> None:
+    # Given
+    manifest = tmp_path / 'manifest.jsonl'
+    manifest.write_text('{"id": "a", "elf": "a.elf"}\n\n{"id": "b", "elf": "b.elf", "end_symbol": "_end"}\n')
+
+    # When
+    actual = load_jobs(manifest, defaults={'end_symbol': '_halt', 'signature': True})
+
+    # Then
+    assert actual == [
+        Job(elf_file=tmp_path / 'a.elf', id='a', end_symbol='_halt', signature=True),
+        Job(elf_file=tmp_path / 'b.elf', id='b', end_symbol='_end', signature=True),
+    ]
+
+
+def test_load_jobs_dir(tmp_path: Path) -> None:
+    # Given
+    (tmp_path / 'b.elf').touch()
+    (tmp_path / 'a.elf').touch()
+    (tmp_path / 'a.S').touch()
+
+    # When
+    actual = load_jobs(tmp_path)
+
+    # Then
+    assert actual == [Job(elf_file=tmp_path / 'a.elf', id='a'), Job(elf_file=tmp_path / 'b.elf', id='b')]
+
+
+def test_signature() -> None:
+    # Given
+    elf = ELF(
+        entry_point=0,
+        memory={8: bytes(range(8))},
+        symbols={'begin_signature': [(8, 0)], 'end_signature': [(16, 0)]},
+    )
+
+    # When
+    actual = signature(elf, memory.segments(elf.memory))
+
+    # Then
+    assert actual == ['03020100', '07060504']
+
+
+def test_signature_unaligned() -> None:
+    elf = ELF(entry_point=0, memory={}, symbols={'begin_signature': [(6, 0)], 'end_signature': [(14, 0)]})
+    with pytest.raises(AssertionError, match='0x00000006'):
+        signature(elf, [])
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pyk.kore.prelude import INT, SORT_K_ITEM, inj, int_dv
+from pyk.kore.syntax import App
+
+import kriscv.kore_builder as kb
+
+
+def test_halt() -> None:
+    # When
+    actual = kb.halt([12, 4, 12], max_instrs=100, env_call=True)
+
+    # Then
+    assert actual == App(
+        'LblHaltAny',
+        (),
+        (
+            kb.halt_at_addresses([inj(INT, SORT_K_ITEM, int_dv(4)), inj(INT, SORT_K_ITEM, int_dv(12))]),
+            App('LblHaltAny', (), (kb.halt_at_instret(int_dv(100)), kb.halt_at_env_call())),
+        ),
+    )
+    assert kb.halt([12]) == kb.halt_at_address(int_dv(12))
+    assert kb.halt() == kb.halt_never()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from kriscv import memory
+
+if TYPE_CHECKING:
+    from typing import Final
+
+
+READ_TEST_DATA: Final[tuple[tuple[dict[int, bytes], int, int, list[int | None]], ...]] = (
+    ({}, 0, 2, [None, None]),
+    ({0: b'\x01\x02'}, 0, 2, [1, 2]),
+    ({2: b'\x01\x02', 6: b'\x03'}, 1, 7, [None, 1, 2, None, None, 3]),
+    ({0: b'\x01\x02\x03\x04'}, 1, 3, [2, 3]),
+    ({0: b'\x01', 8: b'\x02'}, 2, 4, [None, None]),
+)
+
+
+@pytest.mark.parametrize('mem,start,end,expected', READ_TEST_DATA, ids=range(len(READ_TEST_DATA)))
+def test_read(mem: dict[int, bytes], start: int, end: int, expected: list[int | None]) -> None:
+    # When
+    actual = memory.read(memory.segments(mem), start, end)
+
+    # Then
+    assert actual == expected
+
+
+DIFF_TEST_DATA: Final[tuple[tuple[dict[int, bytes], dict[int, bytes], dict[int, bytes]], ...]] = (
+    ({0: b'\x01\x02'}, {0: b'\x01\x02'}, {}),
+    ({0: b'\x01\x02'}, {0: b'\x01\x03'}, {1: b'\x03'}),
+    ({0: b'\x01\x02'}, {0: b'\x01\x02\x03\x04'}, {2: b'\x03\x04'}),
+    ({2: b'\x01\x02'}, {0: b'\x00\x00\x01\x02\x00'}, {0: b'\x00\x00', 4: b'\x00'}),
+    ({0: b'\x01', 2: b'\x02'}, {0: b'\x01\x00\x03'}, {1: b'\x00\x03'}),
+    ({0: bytes(200)}, {0: bytes(100) + b'\x01\x01' + bytes(98)}, {100: b'\x01\x01'}),
+    ({0: bytes(4)}, {0: bytes(4), 16: b'\x05'}, {16: b'\x05'}),
+)
+
+
+@pytest.mark.parametrize('initial,final,expected', DIFF_TEST_DATA, ids=range(len(DIFF_TEST_DATA)))
+def test_diff(initial: dict[int, bytes], final: dict[int, bytes], expected: dict[int, bytes]) -> None:
+    # When
+    actual = memory.diff(initial, memory.segments(final))
+
+    # Then
+    assert {addr: data.tobytes() for addr, data in actual} == expected
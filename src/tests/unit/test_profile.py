@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from kriscv.profile import Profile, phase
+
+
+def test_profile() -> None:
+    # Given
+    profile = Profile()
+
+    # When
+    with profile.phase('load'):
+        pass
+    with phase(profile, 'run'):
+        pass
+    with phase(profile, 'run'):
+        pass
+    with phase(None, 'ignored'):
+        pass
+    profile.count('steps', 10)
+    profile.count('steps', 5)
+    profile.count('instret', 3)
+    profile.sample('segments', 2)
+    profile.sample('segments', 4)
+
+    # Then
+    assert list(profile.phases) == ['load', 'run']
+    assert profile.counters == {'steps': 15, 'instret': 3}
+    assert profile.samples == {'segments': [2, 4]}
+    assert profile.rates['steps_per_instruction'] == 5
+    assert profile.to_dict()['total'] == sum(profile.phases.values())
+    assert 'steps' in profile.pretty()
+    assert 'segments  2 4' in profile.pretty()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pyk.kore.prelude import int_dv, kseq
+from pyk.kore.syntax import App
+
+import kriscv.kore_builder as kb
+from kriscv.snapshot import Snapshot
+from kriscv.state import State
+
+from .test_state import _config
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_snapshot_from_state() -> None:
+    # Given
+    state = State(_config(kseq([App("Lbl'Hash'EXECUTE")])))
+
+    # When
+    actual = Snapshot.from_state(state, depth=10)
+
+    # Then
+    assert actual == Snapshot(
+        depth=10,
+        pc=8,
+        regs={1: 5, 2: 7},
+        memory={2: b'\x01\x02', 5: b'\x03'},
+        halt=kb.halt_at_address(int_dv(12)),
+        instret=3,
+    )
+
+
+def test_snapshot_from_state_not_at_boundary() -> None:
+    # Given
+    state = State(_config(kseq([App("Lbl'Hash'HALT"), App("Lbl'Hash'EXECUTE")])))
+
+    # Then
+    with pytest.raises(ValueError):
+        Snapshot.from_state(state, depth=10)
+
+
+def test_snapshot_write_read(tmp_path: Path) -> None:
+    # Given
+    snapshot = Snapshot(
+        depth=10,
+        pc=8,
+        regs={1: 5, 2: 7},
+        memory={2: b'\x01\x02', 5: b'\xff'},
+        halt=kb.halt_never(),
+        instret=2,
+    )
+    snapshot_file = tmp_path / 'snapshot.json'
+
+    # When
+    snapshot.write(snapshot_file)
+    actual = Snapshot.read(snapshot_file)
+
+    # Then
+    assert actual == snapshot
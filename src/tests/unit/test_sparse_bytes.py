@@ -6,9 +6,12 @@ import pytest
 from pyk.kast.inner import KToken, KVariable
 from pyk.kast.prelude.kint import eqInt, intToken
 from pyk.kast.prelude.ml import mlEqualsTrue
+from pyk.kore.prelude import bytes_dv, int_dv
 
+import kriscv.kore_builder as kb
 import kriscv.term_builder as tb
 from kriscv.sparse_bytes import SparseBytes, SymBytes
+from kriscv.term_manip import strip_inj
 
 if TYPE_CHECKING:
     from pyk.kast.inner import KInner
@@ -83,6 +86,56 @@ def test_to_k(symbytes: SparseBytes, expected: tuple[KInner, list[KInner]]) -> N
     assert symbytes.to_k() == expected
 
 
+@pytest.mark.parametrize(
+    'term,constraints,expected',
+    [(expected0, expected1, symbytes) for (_, _, _, symbytes, expected0, expected1) in SYMBOLIC_MEMORY_TEST_DATA],
+    ids=[test_id for test_id, *_ in SYMBOLIC_MEMORY_TEST_DATA],
+)
+def test_from_k(term: KInner, constraints: list[KInner], expected: SparseBytes) -> None:
+    assert SparseBytes.from_k(term, constraints) == expected
+
+
+def test_from_k_concrete() -> None:
+    # Given
+    sb = SparseBytes([2, b'\xab', 3, b'\xcd'])
+    term, constraints = sb.to_k()
+
+    # When
+    actual = SparseBytes.from_k(term, constraints)
+
+    # Then
+    assert actual == sb
+
+
+def test_from_k_unknown_size() -> None:
+    term, _ = SparseBytes([SymBytes(KVariable('W0', 'Bytes'), 1)]).to_k()
+    with pytest.raises(ValueError):
+        SparseBytes.from_k(term, [])
+
+
+def test_to_kore() -> None:
+    # Given
+    sb = SparseBytes([2, b'\xab', 3, b'\xcd'])
+
+    # When
+    actual = sb.to_kore()
+
+    # Then
+    assert actual == kb.sparse_bytes([2, b'\xab', 3, b'\xcd'])
+    assert strip_inj(actual) == kb.sb_empty_cons(
+        kb.sb_empty(int_dv(2)),
+        kb.sb_bytes_cons(
+            kb.sb_bytes(bytes_dv(b'\xab')),
+            kb.sb_empty_cons(kb.sb_empty(int_dv(3)), kb.sb_bytes_cons(kb.sb_bytes(bytes_dv(b'\xcd')), kb.dot_sb())),
+        ),
+    )
+
+
+def test_to_kore_symbolic() -> None:
+    with pytest.raises(ValueError):
+        SparseBytes([SymBytes(KVariable('W0', 'Bytes'), 1)]).to_kore()
+
+
 def test_which_data() -> None:
     sb = SparseBytes([b'\xab\xab', 3, b'\xcd\xcd'])
     assert sb.which_data(0) == (0, 0)
@@ -125,6 +178,49 @@ def test_setitem() -> None:
         sb[3:4] = SparseBytes([SymBytes(KVariable('W4', 'Bytes'), 1)])
 
 
+def test_setitem_index() -> None:
+    # Given
+    sb = SparseBytes([b'\xab\xab', 3, b'\xcd\xcd', 2, b'\xef'])
+
+    # When
+    sb[4:8] = SparseBytes([b'\x01\x02\x03\x04'])
+
+    # Then
+    assert sb == SparseBytes([b'\xab\xab', 2, b'\x01\x02\x03\x04', 1, b'\xef'])
+    assert len(sb) == 10
+    assert [sb.which_data(addr) for addr in (3, 4, 7, 8, 9, 10)] == [(1, 1), (2, 0), (2, 3), (3, 0), (4, 0), (4, 1)]
+
+
+def test_from_data_many_symbols() -> None:
+    # Given
+    data = {0: bytes(64)}
+    symdata = {addr: SymBytes(KVariable(f'W{addr}', 'Bytes'), 2) for addr in range(60, 0, -4)}
+
+    # When
+    sb = SparseBytes.from_data(data, symdata)
+
+    # Then
+    assert len(sb) == 64
+    assert sb.data[0] == bytes(4)
+    assert sb.data[1::2] == [symdata[addr] for addr in range(4, 64, 4)]
+    assert sb.data[2::2] == [bytes(2)] * 15
+    assert sb.which_data(61) == (29, 1)
+
+
+def test_split_no_copy() -> None:
+    # Given
+    data = b'\xab\xcd\xef\x01'
+    sb = SparseBytes.from_data({0: data}, {2: SymBytes(KVariable('W0', 'Bytes'), 1)})
+
+    # When
+    left, right = sb.split(1)
+
+    # Then
+    assert sb == SparseBytes([b'\xab\xcd', SymBytes(KVariable('W0', 'Bytes'), 1), b'\x01'])
+    items = [item for part in (left, right) for item in part.data if not isinstance(item, SymBytes)]
+    assert all(isinstance(item, memoryview) and item.obj is data for item in items)
+
+
 def test_getitem() -> None:
     sb = SparseBytes([b'\xab\xab', 3, b'\xcd\xef'])
     assert sb[0:2] == SparseBytes([b'\xab\xab'])
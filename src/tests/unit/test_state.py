@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pyk.kore.prelude import INT, SORT_K_ITEM, generated_counter, generated_top, inj, int_dv, kseq
+from pyk.kore.syntax import App
+
+import kriscv.kore_builder as kb
+from kriscv.state import State
+
+if TYPE_CHECKING:
+    from pyk.kore.syntax import Pattern
+
+
+def _config(instrs: Pattern, regs: Pattern | None = None, mem: Pattern | None = None) -> Pattern:
+    def cell(name: str, *args: Pattern) -> App:
+        return App("Lbl'-LT-'" + name + "'-GT-'", (), args)
+
+    return generated_top(
+        (
+            cell(
+                'riscv',
+                cell('instrs', instrs),
+                cell('regs', regs if regs is not None else kb.regs({1: 5, 2: 7})),
+                cell('pc', int_dv(8)),
+                cell('mem', mem if mem is not None else kb.sparse_bytes([2, b'\x01\x02', 1, b'\x03'])),
+                cell('haltCond', kb.halt_at_address(int_dv(12))),
+                cell('instret', int_dv(3)),
+            ),
+            generated_counter(int_dv(0)),
+        )
+    )
+
+
+def test_state() -> None:
+    # Given
+    state = State(_config(kseq([App("Lbl'Hash'HALT"), App("Lbl'Hash'EXECUTE")])))
+
+    # Then
+    assert set(state.cells) == {'instrs', 'regs', 'pc', 'mem', 'haltCond', 'instret', 'generatedCounter'}
+    assert state.pc == 8
+    assert state.instret == 3
+    assert state.registers() == {0: 0, 1: 5, 2: 7}
+    assert state.memory() == {2: 1, 3: 2, 5: 3}
+    assert state.halt_condition == kb.halt_at_address(int_dv(12))
+    assert state.halted
+
+
+def test_state_not_halted() -> None:
+    # Given
+    state = State(_config(kseq([App("Lbl'Hash'EXECUTE")])))
+
+    # Then
+    assert not state.halted
+    with pytest.raises(ValueError):
+        state.cell('stack')
+    with pytest.raises(ValueError):
+        state.kast
+
+
+def test_state_segments() -> None:
+    # Given
+    state = State(_config(kseq([App("Lbl'Hash'EXECUTE")])))
+
+    # When
+    segments = state.segments()
+    diff = state.diff({2: b'\x01\x00'})
+
+    # Then
+    assert [(addr, data.tobytes()) for addr, data in segments] == [(2, b'\x01\x02'), (5, b'\x03')]
+    assert [(addr, data.tobytes()) for addr, data in diff] == [(3, b'\x02'), (5, b'\x03')]
+
+
+def test_state_list_registers() -> None:
+    # Given
+    state = State(_config(kseq([App("Lbl'Hash'EXECUTE")]), kb.reg_file({0: 0, 2: 7})))
+
+    # Then
+    assert state.registers() == {0: 0, 2: 7}
+
+
+def test_state_paged_memory() -> None:
+    # Given
+    page_items: list[tuple[int, list[int | bytes]]] = [(0, [4094, b'\x01\x02']), (4096, [b'\x03', 1, b'\x04'])]
+    pages = kb.map_of(
+        (inj(INT, SORT_K_ITEM, int_dv(page_addr)), inj(kb.SORT_SPARSE_BYTES, SORT_K_ITEM, kb.sparse_bytes(items)))
+        for page_addr, items in page_items
+    )
+    state = State(_config(kseq([App("Lbl'Hash'EXECUTE")]), mem=pages))
+
+    # When
+    segments = state.segments()
+
+    # Then
+    assert [(addr, data.tobytes()) for addr, data in segments] == [(4094, b'\x01\x02\x03'), (4098, b'\x04')]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from pyk.kast.inner import KApply
+from pyk.kast.prelude.kint import intToken
+
+import kriscv.term_builder as tb
+
+
+def test_halt() -> None:
+    # When
+    actual = tb.halt([12, 4, 12], max_instrs=100, env_call=True)
+
+    # Then
+    assert actual == KApply(
+        'HaltAny',
+        tb.halt_at_addresses([tb.word(4), tb.word(12)]),
+        KApply('HaltAny', tb.halt_at_instret(intToken(100)), tb.halt_at_env_call()),
+    )
+    assert tb.halt([12]) == tb.halt_at_address(tb.word(12))
+    assert tb.halt() == tb.halt_never()
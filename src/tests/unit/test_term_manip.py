@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+from pyk.kore.match import match_app
+from pyk.kore.prelude import int_dv
+
+import kriscv.kore_builder as kb
+from kriscv.elf_parser import ELF
+from kriscv.term_manip import (
+    kore_sparse_bytes,
+    match_list,
+    match_map,
+    match_sparse_bytes,
+    normalize_memory,
+    patch_memory,
+)
+
+if TYPE_CHECKING:
+    from typing import Final
+
+
+def test_match_map() -> None:
+    # Given
+    count = 2 * sys.getrecursionlimit()
+    pattern = kb.map_of((int_dv(key), int_dv(2 * key)) for key in range(count))
+
+    # When
+    actual = list(match_map(pattern))
+
+    # Then
+    assert actual == [(int_dv(key), int_dv(2 * key)) for key in range(count)]
+
+
+def test_match_list() -> None:
+    # Given
+    count = 2 * sys.getrecursionlimit()
+    pattern = kb.list_of(int_dv(elem) for elem in range(count))
+
+    # When
+    actual = list(match_list(pattern))
+
+    # Then
+    assert actual == [int_dv(elem) for elem in range(count)]
+
+
+def test_match_sparse_bytes() -> None:
+    # Given
+    pattern = kb.sparse_bytes([2, b'\xab', 3, b'\xcd'])
+
+    # When
+    actual = list(match_sparse_bytes(pattern))
+
+    # Then
+    assert [match_app(item).symbol for item in actual] == [
+        "LblSparseBytes'ColnHash'empty",
+        "LblSparseBytes'ColnHash'bytes",
+        "LblSparseBytes'ColnHash'empty",
+        "LblSparseBytes'ColnHash'bytes",
+    ]
+
+
+def test_kore_sparse_bytes() -> None:
+    # Given
+    count = 2 * sys.getrecursionlimit()
+    items: list[int | bytes] = [item for addr in range(count) for item in (1, addr.to_bytes(2, 'little'))]
+
+    # When
+    actual = kore_sparse_bytes(kb.sparse_bytes(items))
+
+    # Then
+    assert actual == {3 * addr + 1: addr.to_bytes(2, 'little') for addr in range(count)}
+
+
+def test_kore_sparse_bytes_leading_bytes() -> None:
+    assert kore_sparse_bytes(kb.sparse_bytes([b'\xab', 2, b'\xcd\xef'])) == {0: b'\xab', 3: b'\xcd\xef'}
+
+
+def test_normalize_memory() -> None:
+    # Given
+    segments = {addr: bytes([addr % 256]) * 2 for addr in range(0, 2 * sys.getrecursionlimit(), 2)}
+    segments[10_000] = b'\xab'
+
+    # When
+    actual = normalize_memory(segments)
+
+    # Then
+    assert actual == {0: b''.join(segments[addr] for addr in range(0, 2 * sys.getrecursionlimit(), 2)), 10_000: b'\xab'}
+    assert actual[10_000] is segments[10_000]
+
+
+# test id, memory, patches, expected memory
+PATCH_MEMORY_TEST_DATA: Final[tuple[tuple[str, dict[int, bytes], list[tuple[int, bytes]], dict[int, bytes]], ...]] = (
+    ('no-patches', {0: b'\xab\xab', 4: b'\xcd'}, [], {0: b'\xab\xab', 4: b'\xcd'}),
+    ('inside', {0: b'\xab\xab\xab'}, [(1, b'\x01')], {0: b'\xab\x01\xab'}),
+    ('gap', {0: b'\xab', 4: b'\xcd'}, [(2, b'\x01')], {0: b'\xab', 2: b'\x01', 4: b'\xcd'}),
+    ('adjacent', {0: b'\xab', 4: b'\xcd'}, [(1, b'\x01'), (3, b'\x02')], {0: b'\xab\x01', 3: b'\x02\xcd'}),
+    ('bridge', {0: b'\xab', 4: b'\xcd'}, [(1, b'\x01\x02\x03')], {0: b'\xab\x01\x02\x03\xcd'}),
+    ('overlap', {0: b'\xab\xab'}, [(1, b'\x01\x01'), (2, b'\x02')], {0: b'\xab\x01\x02'}),
+    ('override', {}, [(0, b'\x01\x01\x01'), (0, b'\x02')], {0: b'\x02\x01\x01'}),
+    ('empty', {0: b'\xab'}, [(4, b'')], {0: b'\xab'}),
+)
+
+
+@pytest.mark.parametrize(
+    'memory,patches,expected',
+    [(memory, patches, expected) for (_, memory, patches, expected) in PATCH_MEMORY_TEST_DATA],
+    ids=[test_id for test_id, *_ in PATCH_MEMORY_TEST_DATA],
+)
+def test_patch_memory(memory: dict[int, bytes], patches: list[tuple[int, bytes]], expected: dict[int, bytes]) -> None:
+    assert patch_memory(memory, patches) == expected
+
+
+def test_patch_memory_instructions() -> None:
+    # Given
+    elf = ELF(entry_point=4, memory={4: bytes(8)}, symbols={}, code=[4])
+
+    # When
+    memory = patch_memory(elf.memory, [(0, b'\xff' * 4), (8, b'\x13\x00\x00\x00')])
+
+    # Then
+    assert elf.instructions() == {4: 0, 8: 0}
+    assert elf.instructions(memory) == {4: 0, 8: 0x13}
@@ -15,7 +15,7 @@ from pyk.kore.match import kore_int
 from kriscv import build, term_builder
 from kriscv.sparse_bytes import SparseBytes
 from kriscv.term_builder import register
-from kriscv.term_manip import kore_sparse_bytes, normalize_memory
+from kriscv.term_manip import kore_memory, normalize_memory
 
 if TYPE_CHECKING:
     from typing import Final
@@ -260,61 +260,106 @@ def test_disassemble(instr_bits: str, expected: KInner) -> None:
     assert actual == expected
 
 
-# test id, initial memory, addr to write, byte to write
-MEMORY_TEST_DATA: Final[tuple[tuple[str, dict[int, bytes], int, int], ...]] = (
-    ('empty_start', {}, 0, 0x1A),
-    ('empty_later', {}, 10, 0x1A),
-    ('mid_bytes', {1: b'\x7f\x7f'}, 2, 0x1A),
-    ('start_pre_bytes', {1: b'\x7f\x7f'}, 0, 0x1A),
-    ('empty_pre_bytes', {2: b'\x7f\x7f'}, 1, 0x1A),
-    ('end_post_bytes', {2: b'\x7f\x7f'}, 4, 0x1A),
-    ('empty_post_bytes', {2: b'\x7f\x7f', 6: b'\x7f'}, 4, 0x1A),
-    ('end', {2: b'\x7f\x7f'}, 5, 0x1A),
-    ('merge_bytes', {1: b'\x7f\x7f', 4: b'\x7f'}, 3, 0x1A),
+# test id, initial memory, addr to write, value to write, number of bytes to write
+MEMORY_TEST_DATA: Final[tuple[tuple[str, dict[int, bytes], int, int, int], ...]] = (
+    ('empty_start', {}, 0, 0x1A, 1),
+    ('empty_later', {}, 10, 0x1A, 1),
+    ('mid_bytes', {1: b'\x7f\x7f'}, 2, 0x1A, 1),
+    ('start_pre_bytes', {1: b'\x7f\x7f'}, 0, 0x1A, 1),
+    ('empty_pre_bytes', {2: b'\x7f\x7f'}, 1, 0x1A, 1),
+    ('end_post_bytes', {2: b'\x7f\x7f'}, 4, 0x1A, 1),
+    ('empty_post_bytes', {2: b'\x7f\x7f', 6: b'\x7f'}, 4, 0x1A, 1),
+    ('end', {2: b'\x7f\x7f'}, 5, 0x1A, 1),
+    ('merge_bytes', {1: b'\x7f\x7f', 4: b'\x7f'}, 3, 0x1A, 1),
+    ('fill_gap_before', {0: b'\x7f'}, 5, 0x1A, 1),
+    ('fill_gap_after', {40: b'\x7f'}, 30, 0x1A, 1),
+    ('large_gaps', {0: b'\x7f', 60: b'\x7f'}, 30, 0x1A, 1),
+    ('next_page', {4094: b'\x7f\x7f'}, 4096, 0x1A, 1),
+    ('page_end', {4094: b'\x7f\x7f\x7f\x7f'}, 4095, 0x1A, 1),
+    ('mid_bytes_4', {0: b'\x7f' * 8}, 2, 0x1A2B3C4D, 4),
+    ('across_pages_2', {4094: b'\x7f\x7f\x7f\x7f'}, 4095, 0x1A2B, 2),
+    ('across_pages_4', {4094: b'\x7f\x7f\x7f\x7f'}, 4094, 0x1A2B3C4D, 4),
+    ('across_pages_4_unaligned', {4092: b'\x7f' * 8}, 4093, 0x1A2B3C4D, 4),
+    ('across_pages_empty', {}, 4094, 0x1A2B3C4D, 4),
+    ('across_pages_segment', {4000: b'\x7f' * 200}, 4094, 0x1A2B3C4D, 4),
 )
 
 
+def _filled_gap(memory: dict[int, bytes], start: int, end: int) -> dict[int, bytes]:
+    # Bytes written into an uninitialized region are merged with a neighboring segment at most MAX_GAP bytes away
+    max_gap = 16
+    prev_end = max((seg + len(val) for seg, val in memory.items() if seg + len(val) <= start), default=None)
+    if prev_end is not None and 0 < start - prev_end <= max_gap:
+        return {prev_end: bytes(start - prev_end)}
+    next_start = min((seg for seg in memory if seg >= end), default=None)
+    if next_start is not None and 0 < next_start - end <= max_gap:
+        return {end: bytes(next_start - end)}
+    return {}
+
+
 @pytest.mark.parametrize(
-    'memory,addr,byte',
-    [(memory, addr, byte) for (_, memory, addr, byte) in MEMORY_TEST_DATA],
+    'memory,addr,value,num_bytes',
+    [(memory, addr, value, num_bytes) for (_, memory, addr, value, num_bytes) in MEMORY_TEST_DATA],
     ids=[test_id for test_id, *_ in MEMORY_TEST_DATA],
 )
-def test_memory(memory: dict[int, bytes], addr: int, byte: int) -> None:
-    assert 0 <= byte <= 0xFF
+def test_memory(memory: dict[int, bytes], addr: int, value: int, num_bytes: int) -> None:
+    assert 0 <= value < 2 ** (8 * num_bytes)
     for val in memory.values():
         for byte in val:
             assert 0 <= byte <= 0xFF
 
-    byte_val = byte.to_bytes(1, 'big')
-
     # Manually compute the expected final memory state
-    memory_expect: dict[int, bytes] = {}
-    stored = False
-    for start, val in memory.items():
-        if start <= addr and addr < start + len(val):
-            val_idx = addr - start
-            memory_expect[start] = val[:val_idx] + byte_val + val[val_idx + 1 :]
-            stored = True
-        else:
-            memory_expect[start] = val
+    flat = {start + offset: byte for start, val in memory.items() for offset, byte in enumerate(val)}
+    stored = all(addr + offset in flat for offset in range(num_bytes))
+    flat.update((addr + offset, byte) for offset, byte in enumerate(value.to_bytes(num_bytes, 'little')))
     if not stored:
-        memory_expect[addr] = byte_val
-    memory_expect = normalize_memory(memory_expect)
+        for start, gap in _filled_gap(memory, addr, addr + num_bytes).items():
+            flat.update(enumerate(gap, start))
+    memory_expect = normalize_memory({addr: bytes([byte]) for addr, byte in flat.items()})
 
-    # Execute storeByte to get the actual final memory state
+    # Execute storeBytes to get the actual final memory state
     tools = semantics()
     memory_sb, _constraints = SparseBytes.from_concrete(memory).to_k()
+    memory_init = term_builder.init_memory(memory_sb)
     addr_word = term_builder.word(addr)
 
-    store_call = term_builder.store_bytes(memory_sb, addr_word, intToken(byte), intToken(1))
-    memory_actual_sb_kore = _eval_call_to_kore(tools, store_call, term_builder.sort_memory())
-    memory_actual = kore_sparse_bytes(memory_actual_sb_kore)
+    store_call = term_builder.store_bytes(memory_init, addr_word, intToken(value), intToken(num_bytes))
+    memory_actual_kore = _eval_call_to_kore(tools, store_call, term_builder.sort_memory())
+    memory_actual = kore_memory(memory_actual_kore)
 
     assert memory_actual == memory_expect
 
-    # Also execute loadByte and check that we correctly read back the written value
-    memory_actual_sb = tools.krun.kore_to_kast(memory_actual_sb_kore)
-    load_call = term_builder.load_bytes(memory_actual_sb, addr_word, intToken(1))
+    # Also execute loadBytes and check that we correctly read back the written value
+    memory_actual_pages = tools.krun.kore_to_kast(memory_actual_kore)
+    load_call = term_builder.load_bytes(memory_actual_pages, addr_word, intToken(num_bytes))
     load_actual = kore_int(_eval_call_to_kore(tools, load_call, INT))
 
-    assert load_actual == byte
+    assert load_actual == value
+
+
+# test id, initial memory
+INIT_MEMORY_TEST_DATA: Final[tuple[tuple[str, dict[int, bytes]], ...]] = (
+    ('empty', {}),
+    ('single_page', {2: b'\x7f\x7f', 6: b'\x7f'}),
+    ('page_end', {4094: b'\x7f\x7f'}),
+    ('across_pages', {4000: bytes(range(200))}),
+    ('many_pages', {100: bytes(range(256)) * 40}),
+    ('shared_page', {4000: bytes(100), 4100: b'\x01', 4102: b'\x02\x03'}),
+)
+
+
+@pytest.mark.parametrize(
+    'memory',
+    [memory for (_, memory) in INIT_MEMORY_TEST_DATA],
+    ids=[test_id for test_id, *_ in INIT_MEMORY_TEST_DATA],
+)
+def test_init_memory(memory: dict[int, bytes]) -> None:
+    # Given
+    tools = semantics()
+    memory_sb, _constraints = SparseBytes.from_concrete(memory).to_k()
+
+    # When
+    memory_kore = _eval_call_to_kore(tools, term_builder.init_memory(memory_sb), term_builder.sort_memory())
+
+    # Then
+    assert kore_memory(memory_kore) == normalize_memory(memory)